@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Authentication and request options of every module using the StrikeTracker API
+    DOCUMENTATION = r'''
+options:
+    token:
+        description:
+            - Your Highwinds permanent API Token.
+            - One of I(token) or I(login_user) and I(login_pass) is required.
+        required: false
+        type: str
+        aliases: [api_token]
+    login_user:
+        description: Your Highwinds account username.
+        required: false
+        type: str
+        aliases: [user, login_username]
+    login_pass:
+        description: Your Highwinds account password.
+        required: false
+        type: str
+        aliases: [pass, login_password]
+    account:
+        description: The hash ID for your Highwinds account.
+        required: true
+        type: str
+    connect_timeout:
+        description:
+            - Seconds of I(deadline) that must remain for a request to be
+              retried.
+            - Connecting and every read of a request share one socket
+              timeout, the larger of I(connect_timeout) and I(read_timeout).
+        required: false
+        default: 10
+        type: int
+    read_timeout:
+        description:
+            - Seconds to wait for the Highwinds API to accept a connection
+              or send data, unless I(connect_timeout) is larger.
+        required: false
+        default: 60
+        type: int
+    deadline:
+        description:
+            - Overall time budget in seconds for all API requests made by the
+              task, including authentication and retries.
+            - A request is retried only while the remaining budget still
+              covers I(connect_timeout).
+        required: false
+        type: int
+    api_retries:
+        description:
+            - How many times a failed GET, PUT or DELETE request is retried
+              on connection errors, timeouts and 429, 502, 503 or 504
+              responses.
+        required: false
+        default: 0
+        type: int
+    coalesce_reads:
+        description:
+            - Share identical GET requests that are in flight at the same time
+              between the threads of the task and between the forks of a
+              play running it for many hosts.
+            - Forks coordinate through lock files in a directory under the
+              system temp directory that only the current user can read.
+            - A read may get the response of a request that was already in
+              flight when it started.
+        required: false
+        default: false
+        type: bool
+'''
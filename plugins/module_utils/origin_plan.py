@@ -0,0 +1,250 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Reconcile the origins of a Highwinds account against a desired set.
+
+The plan is computed from a single origin list fetch. Existing origins are
+indexed by id, name and hostname so every desired origin is matched in
+constant time, making the whole diff O(n):
+
+  from ansible_collections.sd_hardy.highwinds.plugins.module_utils.origin_plan import OriginPlan
+
+  plan = OriginPlan.build(st.origins(), desired, exclusive=True)
+  results = plan.apply(st, parallelism=4)
+
+A plan can be saved and applied in a later run. Every origin it updates or
+deletes carries the updatedDate it was planned against, and the apply is
+refused if any of them changed in the meantime. Once applied, the plan file
+is marked so that running the same apply again changes nothing:
+
+  plan.save('/tmp/origins.plan', account)
+  plan = OriginPlan.load('/tmp/origins.plan', account)
+  if not plan.applied:
+      plan.verify(st)
+      results = plan.apply(st)
+      plan.mark_applied('/tmp/origins.plan', account)
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import ApiError
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_origin import Origin
+
+
+class OriginPlan:
+    # Attributes an origin needs before the API will create it
+    create_attrs = ['name', 'hostname', 'port', 'path']
+    # Attributes kept for origins to delete in a saved plan
+    delete_attrs = ['id', 'name', 'hostname', 'port', 'path', 'updatedDate']
+    # Most targets verify() looks up by id before fetching the whole list
+    verify_lookups = 5
+    version = 1
+
+    def __init__(self, creates=None, updates=None, deletes=None, applied=False):
+        self.creates = creates if creates is not None else list()
+        self.updates = updates if updates is not None else list()
+        self.deletes = deletes if deletes is not None else list()
+        self.applied = applied
+
+    @classmethod
+    def build(cls, current, desired, exclusive=False, allow_empty=False):
+        """ Diff the desired origin dicts against the current origin list
+
+        An empty authoritative set would delete every origin in the account,
+        so it is refused unless `allow_empty` is set.
+        """
+        if exclusive and not desired and not allow_empty:
+            raise ApiError(
+                "Refusing to delete every origin in the account: the desired "
+                "origin set is empty")
+        origins = current.list if current is not None else list()
+        by_id, by_name, by_hostname = dict(), dict(), dict()
+        for o in origins:
+            by_id[o.id] = o
+            by_name.setdefault(o.name, o)
+            by_hostname.setdefault(o.hostname, list()).append(o)
+
+        plan, claimed = cls(), set()
+        for params in desired:
+            params = dict((k, v) for k, v in params.items() if v is not None)
+            origin = by_id.get(params.get('id'))
+            if origin is None and params.get('id') is not None:
+                raise ApiError("Origin with id %s does not exist" % params['id'])
+            if origin is None:
+                origin = by_name.get(params.get('name'))
+            if origin is None:
+                for o in by_hostname.get(params.get('hostname'), list()):
+                    if o.id not in claimed:
+                        origin = o
+                        break
+            if origin is not None and origin.id in claimed:
+                raise ApiError(
+                    "Origin %s (%s) is matched by more than one desired origin"
+                    % (origin.name, origin.id))
+
+            params.pop('id', None)
+            if origin is None:
+                missing = [a for a in cls.create_attrs if a not in params]
+                if missing:
+                    raise ApiError(
+                        "Unable to create origin %s, missing: %s"
+                        % (params.get('name', params.get('hostname')), ', '.join(missing)))
+                plan.creates.append(Origin(params).format_payload())
+                continue
+            claimed.add(origin.id)
+            updates = origin.requires_update(params)
+            if updates:
+                plan.updates.append((origin, updates))
+
+        if exclusive:
+            plan.deletes = [o for o in origins if o.id not in claimed]
+        return plan
+
+    @property
+    def changed(self):
+        return bool(self.creates or self.updates or self.deletes)
+
+    def to_dict(self):
+        return dict(
+                create=list(self.creates),
+                update=list(dict(id=o.id, name=o.name, changes=u)
+                            for o, u in self.updates),
+                delete=list(dict(id=o.id, name=o.name) for o in self.deletes),
+                )
+
+    def save(self, path, account):
+        """ Write the plan to `path`, readable only by the current user """
+        plan = dict(
+                version=self.version,
+                account=account,
+                applied=self.applied,
+                create=self.creates,
+                update=list(dict(id=o.id,
+                                 updatedDate=getattr(o, 'updatedDate', None),
+                                 changes=u,
+                                 payload=o.format_payload(u))
+                            for o, u in self.updates),
+                delete=list(dict((a, getattr(o, a, None)) for a in self.delete_attrs)
+                            for o in self.deletes),
+                )
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.origin-plan-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(plan, f, separators=(',', ':'))
+            os.replace(tmp, path)
+        except (IOError, OSError) as e:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise ApiError("Unable to write plan file %s: %s" % (path, e))
+
+    @classmethod
+    def load(cls, path, account):
+        """ Read a plan written by save() for the same account """
+        try:
+            with open(path) as f:
+                plan = json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            raise ApiError("Unable to read plan file %s: %s" % (path, e))
+        if plan.get('version') != cls.version:
+            raise ApiError("Unsupported plan file version: %s" % plan.get('version'))
+        if plan.get('account') != account:
+            raise ApiError("Plan file %s was written for account %s"
+                           % (path, plan.get('account')))
+        updates = list()
+        for u in plan['update']:
+            origin = Origin(dict(u['payload'], id=u['id'], updatedDate=u['updatedDate']))
+            updates.append((origin, u['changes']))
+        return cls(creates=plan['create'],
+                   updates=updates,
+                   deletes=list(Origin(d) for d in plan['delete']),
+                   applied=plan.get('applied', False))
+
+    def mark_applied(self, path, account):
+        """ Record in the plan file that the plan has been applied """
+        self.applied = True
+        self.save(path, account)
+
+    def verify(self, st):
+        """ Refuse a plan whose targets changed since it was computed
+
+        Up to `verify_lookups` targets are fetched one by one; larger plans,
+        and plans creating origins whose names must still be free, fetch the
+        origin list once instead.
+        """
+        if not self.changed:
+            return
+        targets = [o for o, u in self.updates] + self.deletes
+        if not self.creates and len(targets) <= self.verify_lookups:
+            by_id = dict()
+            for target in targets:
+                origin = st.origins(origin_id=target.id)
+                if origin is not None:
+                    by_id[origin.id] = origin
+            names = set()
+        else:
+            current = st.origins()
+            origins = current.list if current is not None else list()
+            by_id = dict((o.id, o) for o in origins)
+            names = set(o.name for o in origins)
+        for target in targets:
+            origin = by_id.get(target.id)
+            if origin is None:
+                raise ApiError("Plan is stale: origin %s (%s) no longer exists"
+                               % (target.name, target.id))
+            if getattr(origin, 'updatedDate', None) != target.updatedDate:
+                raise ApiError("Plan is stale: origin %s (%s) was updated at %s"
+                               % (target.name, target.id, origin.updatedDate))
+        for payload in self.creates:
+            if payload['name'] in names:
+                raise ApiError("Plan is stale: origin %s already exists"
+                               % payload['name'])
+
+    def _create(self, st, payload):
+        return 'created', st.origins(method='POST', config=payload)
+
+    def _update(self, st, origin, updates):
+        return 'updated', st.origins(origin_id=origin.id, method='PUT',
+                                     config=origin.format_payload(updates))
+
+    def _delete(self, st, origin):
+        st.origins(origin_id=origin.id, method='DELETE')
+        return 'deleted', origin
+
+    def _run(self, pool, calls, results):
+        futures = [pool.submit(fn, *args) for fn, args in calls]
+        for future, (fn, args) in zip(futures, calls):
+            try:
+                action, origin = future.result()
+                if origin is None:
+                    raise ApiError("No origin in the API response to %s" % fn.__name__[1:])
+                results[action].append(origin.to_dict())
+            except ApiError as e:
+                results['failed'].append(e.msg)
+            except Exception as e:
+                # Keep the record of the writes that did succeed
+                results['failed'].append(str(e) or type(e).__name__)
+
+    def apply(self, st, parallelism=4):
+        """ Execute the plan, at most `parallelism` requests at a time
+
+        Creates and updates run first so anything being repointed at a new
+        origin has it available; deletes only run once every write before
+        them succeeded.
+        """
+        results = dict(created=list(), updated=list(), deleted=list(), failed=list())
+        with ThreadPoolExecutor(max_workers=max(1, parallelism)) as pool:
+            writes = [(self._create, (st, p)) for p in self.creates]
+            writes += [(self._update, (st, o, u)) for o, u in self.updates]
+            self._run(pool, writes, results)
+            if not results['failed']:
+                deletes = [(self._delete, (st, o)) for o in self.deletes]
+                self._run(pool, deletes, results)
+        return results
@@ -0,0 +1,45 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Certificate model for the StrikeTracker API."""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import JsonHandler
+
+
+class Certificate:
+    # The API does not always return these values
+    optional_attrs = ['ciphers','key','certificate']
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+    def _get_attrs(self=None): 
+        return {'id','commonName','caBundle','domains','fingerprint','issuer',
+                'requester','createdDate','updatedDate','expirationDate','trusted',
+                'certificateInformation'}
+    def to_dict(self):
+        d = dict(
+                id=self.id,
+                commonName=self.commonName,
+                caBundle=self.caBundle,
+                domains=self.domains,
+                fingerprint=self.fingerprint,
+                issuer=self.issuer,
+                requester=self.requester,
+                createdDate=self.createdDate,
+                updatedDate=self.updatedDate,
+                expirationDate=self.expirationDate,
+                trusted=self.trusted,
+                certificateInformation=self.certificateInformation,
+                )
+        # Handle 'Optional' attributes (in API)
+        for a in [at for at in self.optional_attrs if hasattr(self, at)]:
+            d[a] = getattr(self, a)
+        return d
+
+JsonHandler.register(Certificate, 90)
@@ -0,0 +1,379 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Core StrikeTracker API client used by the Highwinds CDN modules.
+
+Only the client and the generic List container live here. The resource
+models are in their own module_utils and register themselves with
+JsonHandler when imported, so a module only ships and decodes the models it
+imports:
+
+  from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import ApiClient, ApiError
+  from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_origin import Origin
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import hashlib
+import json
+import socket
+import threading
+import time
+from json import JSONEncoder, JSONDecodeError
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_json import encode_payload
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_flight import SingleFlight
+from ansible.module_utils.urls import open_url
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible.module_utils.six.moves.urllib.parse import urlencode
+
+
+class ApiError(Exception):
+    def __init__(self, msg):
+        self.msg = msg
+
+class List:
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+
+    def _get_attrs(self=None): return {'list'}
+    def to_dict(self): 
+        return list(i.to_dict() for i in self.list)
+
+class JsonHandler(JSONEncoder):
+    # (priority, attrs, class) of the models find_class decodes, see register()
+    models = []
+
+    def default(self, i):
+        if hasattr(i, 'to_dict'):
+            return i.to_dict()
+        return i.__dict__
+
+    def register(cls, priority):
+        """ Decode dicts holding all of cls._get_attrs() into cls
+
+        Models are tried from the lowest priority up, and a model may narrow
+        its match further with a _matches(json_dict) function.
+        """
+        JsonHandler.models.append((priority, frozenset(cls._get_attrs()), cls))
+        JsonHandler.models.sort(key=lambda m: m[0])
+
+    def find_class(json_dict):
+        keys = json_dict.keys()
+        for priority, attrs, cls in JsonHandler.models:
+            if keys >= attrs:
+                if not hasattr(cls, '_matches') or cls._matches(json_dict):
+                    return cls(json_dict)
+        if 'list' in json_dict:
+            return List(json_dict)
+
+        #print('No json decoder for dict', json_dict)
+        return json_dict
+
+class ApiClient:
+    # Methods that are safe to send again after a failed attempt
+    idempotent_methods = ['GET', 'PUT', 'DELETE']
+    # HTTP statuses worth another attempt
+    retry_codes = [429, 502, 503, 504]
+    # Seconds before expiry at which an OAuth2 token is renewed
+    refresh_margin = 60
+
+    def __init__(self,username=None,password=None,token=None,account=None,
+                 connect_timeout=10,read_timeout=60,deadline=None,retries=0,
+                 coalesce=False,coalesce_dir=None):
+        """ Timeouts and the deadline are in seconds. The deadline covers
+        every request made by this client, including authentication and
+        retries, and is counted from when the client is created. open_url
+        has a single socket timeout, so each attempt waits at most the larger
+        of the two timeouts; `connect_timeout` is also the part of the
+        deadline a retry needs to be attempted.
+
+        With `coalesce`, identical concurrent GET requests share a single
+        API call. Setting `coalesce_dir` extends this to other processes
+        using the same directory.
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = None
+        if deadline is not None:
+            self.deadline = time.monotonic() + deadline
+        self.retries = retries
+        self.flight = None
+        if coalesce:
+            self.flight = SingleFlight(directory=coalesce_dir)
+        self.account = account
+        self.baseurl = 'https://striketracker.highwinds.com'
+        self.apiurl = self.baseurl+'/api/v1/accounts/'+self.account
+        self.agent = "ansible-highwinds (Python-urllib/3.8)"
+        self.tokenurl = self.baseurl + '/auth/token'
+        self.headers = {'X-Application-Id': self.agent,'Accept': 'application/json, text/plain, * / *'}
+        self.token = token
+        self.refresh_token = None
+        self.expires_at = self.renew_at = None
+        self._credentials = None
+        self._renew_lock = threading.Lock()
+        self._renew_timer = None
+        if self.token:
+            self.headers['Authorization'] = "Bearer %s" % self.token
+        else:
+            self._get_token(username,password)
+
+    def _to_json(self,data):
+        try:
+            return encode_payload(data)
+        except (TypeError, ValueError) as e:
+            raise ApiError("Unable to convert payload to JSON. Reason: %s" % e)
+
+    def _format_payload(self, data):
+        # Passwords and refresh tokens may contain '&', '=' or '+'
+        params = list((key, val) for key, val in data.items() if val is not None)
+        return urlencode(params).encode()
+
+    def _build_params(self,params):
+        if len(params) == 1:
+            items = params.items()
+            #print('items:',items[1])
+
+    def _get_token(self, username, password):
+        """ Get an OAuth2 token using the provided credentials """
+        if not username and not password:
+            raise ApiError(
+                "You must provide an API Token or a "
+                "Username and Password to authenticate"
+            )
+        self._credentials = (username, password)
+        self._request_token(
+            dict(
+                grant_type='password',
+                username=username,
+                password=password
+            )
+        )
+
+    def _request_token(self, grant):
+        """ Exchange an OAuth2 grant for a token and schedule its renewal """
+        headers = dict((k, v) for k, v in self.headers.items()
+                       if k not in ['Authorization', 'Content-Type'])
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        result = self.request(
+            'POST',
+            self.tokenurl,
+            self._format_payload(grant),
+            headers=headers,
+        )
+        if not result:
+            return False
+        try:
+            response = json.loads(result)
+        except JSONDecodeError as e:
+            raise ApiError(
+                "Unable to decode API response."
+                "Reason: %s. %s %s"
+                % (e.msg, e.doc, e.pos)
+            )
+        self.token = response['access_token']
+        self.headers['Authorization'] = "Bearer %s" % self.token
+        self.refresh_token = response.get('refresh_token', self.refresh_token)
+        self.expires_at = self.renew_at = None
+        if response.get('expires_in'):
+            expires_in = int(response['expires_in'])
+            self.expires_at = time.monotonic() + expires_in
+            # Short lived tokens are renewed halfway through their lifetime
+            self.renew_at = self.expires_at - min(self.refresh_margin, expires_in / 2)
+            self._schedule_renewal()
+        return True
+
+    def _schedule_renewal(self):
+        """ Renew the token in the background shortly before it expires """
+        self._cancel_renewal()
+        delay = max(self.renew_at - time.monotonic(), 0)
+        self._renew_timer = threading.Timer(delay, self._renew_in_background, [self.token])
+        self._renew_timer.daemon = True
+        self._renew_timer.start()
+
+    def _cancel_renewal(self):
+        if self._renew_timer is not None:
+            self._renew_timer.cancel()
+            self._renew_timer = None
+
+    def _renew_in_background(self, token):
+        try:
+            self._renew(token)
+        except ApiError:
+            # The next request renews inline and reports the error
+            pass
+
+    def _renew(self, token):
+        """ Replace `token` with a fresh one
+
+        Callers that find the same stale token wait on a single renewal;
+        whoever gets the lock after it finished sees the new token and
+        returns without requesting another.
+        """
+        with self._renew_lock:
+            if self.token != token:
+                return
+            if self.refresh_token is not None:
+                try:
+                    self._request_token(
+                        dict(
+                            grant_type='refresh_token',
+                            refresh_token=self.refresh_token
+                        )
+                    )
+                    return
+                except ApiError:
+                    if self._credentials is None:
+                        raise
+            if self._credentials is None:
+                raise ApiError("The API token has expired and cannot be renewed")
+            self._get_token(*self._credentials)
+
+    def _check_token(self):
+        """ Renew an OAuth2 token that is about to expire before using it """
+        if self.renew_at is None:
+            return
+        if time.monotonic() >= self.renew_at:
+            self._renew(self.token)
+
+    def close(self):
+        """ Stop the background token renewal """
+        self._cancel_renewal()
+
+    def _timeout(self, url, deadline, retry=False):
+        """ Socket timeout for the next attempt, bounded by the deadline
+
+        open_url takes a single socket timeout that covers connecting and
+        every read, so the attempt gets the larger of the two limits. The
+        first attempt gets whatever is left of the deadline; a retry is
+        refused outright when the deadline cannot cover the connect timeout.
+        """
+        timeout = max(self.connect_timeout, self.read_timeout)
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or (retry and remaining < self.connect_timeout):
+            raise ApiError(
+                "Deadline exceeded before API request could be attempted. "
+                "URL: %s, Remaining: %.1fs, Connect timeout: %ss"
+                % (url, max(remaining, 0), self.connect_timeout))
+        return min(timeout, remaining)
+
+    def _backoff(self, attempt, deadline):
+        """ Wait before retrying, unless that would exhaust the deadline """
+        delay = min(0.5 * 2 ** attempt, 10)
+        if deadline is not None:
+            if deadline - time.monotonic() - delay < self.connect_timeout:
+                return False
+        time.sleep(delay)
+        return True
+
+    def _flight_key(self, url):
+        """ Reads are only shared between clients of the same API user """
+        if self._credentials is not None:
+            identity = 'user:%s' % self._credentials[0]
+        else:
+            identity = 'token:%s' % hashlib.sha256(self.token.encode('utf-8')).hexdigest()
+        return ' '.join([identity, url])
+
+    def request(self, method='GET', url=None, data=None, deadline=None, headers=None):
+        """ Make a request to the StrikeTracker API
+
+        `deadline` is a time.monotonic() timestamp and defaults to the
+        client's own deadline.
+        """
+        if deadline is None:
+            deadline = self.deadline
+        if self.flight is not None and method == 'GET' and url != self.tokenurl:
+            return self.flight.do(
+                self._flight_key(url),
+                lambda: self._request(method, url, data, deadline, headers),
+                deadline=deadline)
+        return self._request(method, url, data, deadline, headers)
+
+    def _request(self, method, url, data, deadline, headers):
+        authenticated = url != self.tokenurl
+        retry = method in self.idempotent_methods
+        attempt, renewed = 0, False
+        while True:
+            if authenticated:
+                self._check_token()
+            token = self.token
+            try:
+                r = open_url(
+                    url,
+                    method=method,
+                    data=data,
+                    headers=headers if headers is not None else dict(self.headers),
+                    http_agent=self.agent,
+                    timeout=self._timeout(url, deadline, retry=attempt > 0 or renewed))
+                return r.read()
+            except HTTPError as e:
+                if e.code == 404:
+                    return None
+                if (e.code == 401 and authenticated and not renewed
+                        and (self.refresh_token or self._credentials)):
+                    # The token was revoked or expired early
+                    self._renew(token)
+                    renewed = True
+                    continue
+                if (retry and e.code in self.retry_codes and attempt < self.retries
+                        and self._backoff(attempt, deadline)):
+                    attempt += 1
+                    continue
+                response = e.read()
+                try:
+                    response = json.loads(response)
+                except (TypeError, ValueError):
+                    pass
+                errmsg = "Unable to complete API request. URL: %s, Status: %i, Reason: %s" % (url, e.code, e.reason)
+                if type(response) is dict: 
+                    if 'error' in response and response['error']:
+                        errmsg += ", Error: %s" % response['error']
+                raise ApiError(errmsg)
+            except (URLError, socket.timeout) as e:
+                if (retry and attempt < self.retries
+                        and self._backoff(attempt, deadline)):
+                    attempt += 1
+                    continue
+                raise ApiError(
+                    "Unable to complete API request. URL: %s, Reason: %s"
+                    % (url, getattr(e, 'reason', e)))
+      
+    def ip_whitelist(self,deadline=None):
+        """ Get the IP ranges the CDN pulls from origins with """
+        response = self.request('GET', self.baseurl + '/api/v1/ipWhitelist',
+                                deadline=deadline)
+        if not response:
+            return None
+        try:
+            return json.loads(response, object_hook=JsonHandler.find_class)
+        except JSONDecodeError as e:
+            raise ApiError(
+                "Unable to decode API response."
+                "Reason: %s. %s %s"
+                % (e.msg, e.doc, e.pos))
+
+    def origins(self,method='GET',origin_id=None,config=None,deadline=None):
+        """ Handle the origin resource """
+        result,url = None,self.apiurl + '/origins'
+        if origin_id is not None:
+            url += '/' + str(origin_id)        
+        if method in ['POST','PUT']:
+            self.headers['Content-Type'] = 'application/json'
+            config = self._to_json(config)
+        response = self.request(method, url, config, deadline=deadline)
+        if not response:
+            return None
+        
+        try:
+            return json.loads(response, object_hook=JsonHandler.find_class)
+        except JSONDecodeError as e:
+            raise ApiError(
+                "Unable to decode API response."
+                "Reason: %s. %s %s"
+                % (e.msg, e.doc, e.pos))
@@ -0,0 +1,195 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Coalesce identical concurrent API reads.
+
+The first caller for a key becomes the leader and makes the request; callers
+arriving while it is in flight wait and get the same response. Threads of one
+process wait on an event. When a directory is given, separate processes (e.g.
+Ansible forks running the same task) coordinate through a lock file per key
+and the leader leaves its response next to it for the waiting processes:
+
+  from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_flight import SingleFlight
+
+  flight = SingleFlight(directory=SingleFlight.default_directory())
+  body = flight.do(key, lambda: fetch(url), deadline=deadline)
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import errno
+import fcntl
+import hashlib
+import os
+import stat
+import tempfile
+import threading
+import time
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    # Seconds between attempts to take a lock file held by another process
+    poll_interval = 0.02
+    # Seconds after which lock and result files are removed from the directory
+    max_age = 300
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._flights = dict()
+        self._expired = False
+
+    @staticmethod
+    def default_directory():
+        """ A directory only the current user can read
+
+        The name is predictable, so an existing path is only used if it is a
+        real directory owned by the current user with no group or other
+        permissions.
+        """
+        path = os.path.join(tempfile.gettempdir(), 'highwinds-%d' % os.getuid())
+        try:
+            os.mkdir(path, 0o700)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        st = os.lstat(path)
+        if not stat.S_ISDIR(st.st_mode):
+            raise OSError("Refusing to coalesce reads in %s: not a directory" % path)
+        if st.st_uid != os.getuid():
+            raise OSError("Refusing to coalesce reads in %s: owned by uid %d"
+                          % (path, st.st_uid))
+        if st.st_mode & 0o077:
+            raise OSError("Refusing to coalesce reads in %s: mode %o is not private"
+                          % (path, stat.S_IMODE(st.st_mode)))
+        return path
+
+    def do(self, key, fn, deadline=None):
+        """ Call fn() once for all concurrent callers with the same key
+
+        `deadline` is a time.monotonic() timestamp bounding how long a caller
+        waits for another leader. Errors of the leader are raised in every
+        caller that waited on it within this process.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
+            if not flight.done.wait(timeout):
+                return fn()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            if self.directory is None:
+                flight.result = fn()
+            else:
+                flight.result = self._do_shared(key, fn, deadline)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _do_shared(self, key, fn, deadline):
+        """ Coalesce across processes with a lock file per key """
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        lock_path = os.path.join(self.directory, name + '.lock')
+        result_path = os.path.join(self.directory, name + '.result')
+        arrived = time.time()
+        if not self._expired:
+            self._expired = True
+            self._expire(arrived - self.max_age)
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if not self._try_lock(fd):
+                # Another process is fetching; wait for it to finish
+                while not self._try_lock(fd):
+                    if deadline is not None and time.monotonic() >= deadline:
+                        return fn()
+                    time.sleep(self.poll_interval)
+                found, result = self._read(result_path, arrived)
+                if found:
+                    return result
+            result = fn()
+            self._write(result_path, result)
+            return result
+        finally:
+            os.close(fd)
+
+    def _expire(self, before):
+        """ Remove the files of flights that ended before `before`
+
+        Waiters only read results written after they arrived, so an old
+        result is never used. A lock file is only removed while it can be
+        locked, i.e. when no leader holds it; a process that still has it
+        open at worst makes the request again itself.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                if os.lstat(path).st_mtime >= before:
+                    continue
+                if not name.endswith('.lock'):
+                    os.remove(path)
+                    continue
+                fd = os.open(path, os.O_RDWR)
+                try:
+                    if self._try_lock(fd):
+                        os.remove(path)
+                finally:
+                    os.close(fd)
+            except (IOError, OSError):
+                # Removed or taken over by another process in the meantime
+                continue
+
+    def _try_lock(self, fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except (IOError, OSError) as e:
+            if e.errno not in [errno.EAGAIN, errno.EACCES, errno.EWOULDBLOCK]:
+                raise
+            return False
+
+    def _read(self, path, arrived):
+        """ The result written by a leader that finished after we arrived """
+        try:
+            if os.stat(path).st_mtime < arrived:
+                return False, None
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError):
+            return False, None
+        if not data:
+            return False, None
+        # The first byte tells a missing (404) response from an empty body
+        return True, data[1:] if data[:1] == b'1' else None
+
+    def _write(self, path, result):
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'0' if result is None else b'1' + result)
+        os.replace(tmp, path)
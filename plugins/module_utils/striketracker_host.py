@@ -0,0 +1,145 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Host, scope and service models for the StrikeTracker API."""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import JsonHandler
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_json import dumps
+
+
+class Scope:
+    # The API does not always return these values
+    optional_attrs = ['name']
+
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+
+    def _get_attrs(self=None): return {'id','platform','path','createdDate','updatedDate'}
+
+    def to_dict(self):
+        d = dict(
+                id=self.id,
+                platform=self.platform,
+                path=self.path,
+                createdDate=self.createdDate,
+                updatedDate=self.updatedDate
+                )
+        # Handle 'Optional' attributes (in API)
+        for a in [at for at in self.optional_attrs if hasattr(self, at)]:
+            d[a] = getattr(self, a)
+        return d
+
+class ScopeIndex:
+    """ Scopes of a host keyed by platform and path
+
+    Paths are matched on whole segments, so the longest matching scope is
+    found in one dict lookup per path segment regardless of the number of
+    scopes on the host. Scopes of the ALL platform apply to every platform.
+    Entries that were not decoded into a Scope, or have no path, are left
+    out of the index.
+    """
+    def __init__(self, scopes=None):
+        self.platforms = dict()
+        if scopes is not None:
+            for scope in scopes:
+                self.add(scope)
+
+    @staticmethod
+    def _normalize(path):
+        return '/' + path.strip('/')
+
+    def add(self, scope):
+        if not isinstance(scope, Scope) or getattr(scope, 'path', None) is None:
+            return
+        # Paths such as /a and /a/ share a key; every scope is kept and the
+        # first one added is returned by lookups
+        paths = self.platforms.setdefault(scope.platform, dict())
+        paths.setdefault(self._normalize(scope.path), list()).append(scope)
+
+    def get(self, path, platform='CDS'):
+        """ Return the scope at exactly `path`, or None """
+        paths = self.platforms.get(platform, dict())
+        scopes = paths.get(self._normalize(path))
+        return scopes[0] if scopes else None
+
+    def match(self, path, platform='CDS'):
+        """ Return the scope with the longest path that `path` falls under
+
+        At the same path a scope of `platform` wins over one of ALL.
+        """
+        candidates = [self.platforms.get(platform, dict()),
+                      self.platforms.get('ALL', dict())]
+        path = self._normalize(path)
+        while True:
+            for paths in candidates:
+                if path in paths:
+                    return paths[path][0]
+            if path == '/':
+                return None
+            path = path.rsplit('/', 1)[0] or '/'
+
+    def scopes(self, platform='CDS'):
+        return list(s for scopes in self.platforms.get(platform, dict()).values()
+                    for s in scopes)
+
+    def __len__(self):
+        return sum(len(scopes) for paths in self.platforms.values()
+                   for scopes in paths.values())
+
+class ScopeContainer:
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+    def _get_attrs(self=None): return {'scope'}
+    def to_dict(self): 
+        return self.scope.to_dict()
+
+class Service:
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+    def _get_attrs(self=None): return {'id','name','description','type'}
+    def to_dict(self):
+        return dict(
+                id=self.id,
+                name=self.name,
+                description=self.description,
+                type=self.type
+                )
+
+class Host:
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+        # Built once when the host is decoded, see ScopeIndex
+        self.scope_index = ScopeIndex(getattr(self, 'scopes', None))
+
+    def _get_attrs(self=None): return {'name','hashCode','type','services','scopes','createdDate','updatedDate'}
+    def to_dict(self):
+        return dict(
+                name=self.name,
+                hashCode=self.hashCode,
+                type=self.type,
+                createdDate=self.createdDate,
+                updatedDate=self.updatedDate,
+                scopes=list(scope.to_dict() if hasattr(scope, 'to_dict') else scope
+                            for scope in self.scopes),
+                services=list(service.to_dict() for service in self.services),
+                )
+    def to_json(self):
+        return dumps(self).decode('utf-8')
+
+JsonHandler.register(Service, 10)
+JsonHandler.register(Scope, 20)
+JsonHandler.register(Host, 30)
+JsonHandler.register(ScopeContainer, 110)
@@ -0,0 +1,110 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""IP list model for the StrikeTracker API."""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import ipaddress
+from bisect import bisect_right
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import JsonHandler
+
+
+def _ip_ranges(cidrs):
+    """ Merge CIDR strings into sorted, non-overlapping (start, end) integer
+    ranges per IP version
+    """
+    ranges = {4: list(), 6: list()}
+    for cidr in cidrs:
+        net = ipaddress.ip_network(u'%s' % cidr.strip(), strict=False)
+        ranges[net.version].append((int(net.network_address), int(net.broadcast_address)))
+    for version, spans in ranges.items():
+        merged = list()
+        for start, end in sorted(spans):
+            if merged and start <= merged[-1][1] + 1:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        ranges[version] = merged
+    return ranges
+
+def _ip_subtract(a, b):
+    """ Parts of the sorted ranges `a` not covered by the sorted ranges `b` """
+    result, j = list(), 0
+    for start, end in a:
+        while j < len(b) and b[j][1] < start:
+            j += 1
+        k = j
+        while start <= end and k < len(b) and b[k][0] <= end:
+            if b[k][0] > start:
+                result.append((start, b[k][0] - 1))
+            start = max(start, b[k][1] + 1)
+            k += 1
+        if start <= end:
+            result.append((start, end))
+    return result
+
+def _ip_cidrs(version, spans):
+    cls = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+    cidrs = list()
+    for start, end in spans:
+        cidrs.extend(str(net) for net in
+                     ipaddress.summarize_address_range(cls(start), cls(end)))
+    return cidrs
+
+class IpList:
+    """ A set of IP networks stored as merged, sorted integer ranges
+
+    `list` gives the set back as the smallest list of CIDRs covering it.
+    """
+    def __init__(self, d=None):
+        self.ranges = {4: list(), 6: list()}
+        if d is not None:
+            for k,v in d.items():
+                if k == 'list':
+                    self.ranges = _ip_ranges(v)
+                else:
+                    setattr(self, k, v)
+        self._starts = dict((v, list(s for s, e in spans))
+                            for v, spans in self.ranges.items())
+    def _get_attrs(self=None): return {'list'}
+    @property
+    def list(self):
+        return _ip_cidrs(4, self.ranges[4]) + _ip_cidrs(6, self.ranges[6])
+    def to_dict(self): return dict(list=self.list)
+    def __len__(self):
+        return len(self.ranges[4]) + len(self.ranges[6])
+    def __contains__(self, address):
+        """ True if the address or network is entirely inside the set """
+        net = ipaddress.ip_network(u'%s' % str(address).strip(), strict=False)
+        start, end = int(net.network_address), int(net.broadcast_address)
+        i = bisect_right(self._starts[net.version], start) - 1
+        return i >= 0 and self.ranges[net.version][i][1] >= end
+    def diff(self, cidrs):
+        """ Compare with another list of CIDRs, e.g. a local allowlist
+
+        Returns the entries of `cidrs`, exactly as given, that are not
+        entirely inside this set as `removed`, and the CIDRs of this set not
+        covered by the remaining entries as `added`. Applying both gives an
+        allowlist that covers this set and nothing outside it.
+        """
+        kept, removed = list(), list()
+        for cidr in cidrs:
+            if cidr in self:
+                kept.append(cidr)
+            else:
+                removed.append(cidr)
+        other = _ip_ranges(kept)
+        added = list()
+        for version in [4, 6]:
+            added += _ip_cidrs(version, _ip_subtract(self.ranges[version], other[version]))
+        return dict(added=added, removed=removed)
+    def _matches(json_dict):
+        # Only non empty lists of strings, anything else is a List
+        return bool(json_dict['list']) and type(json_dict['list'][0]) is str
+
+JsonHandler.register(IpList, 120)
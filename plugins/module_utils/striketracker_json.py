@@ -0,0 +1,61 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""JSON encoding for StrikeTracker request payloads and models.
+
+Models are encoded straight from their to_dict() output, and every payload
+is serialized exactly once. orjson is used when it is installed, otherwise
+the standard library json module:
+
+  from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_json import dumps
+
+  body = dumps(origin)  # bytes
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+BACKEND = 'orjson' if HAS_ORJSON else 'json'
+
+
+def _default(obj):
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError("Object of type %s is not JSON serializable"
+                    % type(obj).__name__)
+
+
+# Built once, json.dumps creates a new encoder per call for non-default options
+_encoder = json.JSONEncoder(default=_default, separators=(',', ':'))
+
+
+def dumps(obj):
+    """ Encode a model, or plain data containing models, as compact JSON bytes
+
+    Raises TypeError or ValueError when `obj` cannot be encoded.
+    """
+    if hasattr(obj, 'to_dict'):
+        obj = obj.to_dict()
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_default)
+    return _encoder.encode(obj).encode('utf-8')
+
+
+def encode_payload(payload):
+    """ Request body for `payload`, which may already be encoded JSON """
+    if payload is None or isinstance(payload, bytes):
+        return payload
+    if isinstance(payload, str):
+        return payload.encode('utf-8')
+    return dumps(payload)
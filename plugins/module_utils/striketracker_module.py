@@ -0,0 +1,70 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Options and client setup shared by the Highwinds modules.
+
+The options are documented in the sd_hardy.highwinds.api doc fragment:
+
+  from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_module import (
+      API_MUTUALLY_EXCLUSIVE, API_REQUIRED_ONE_OF, API_REQUIRED_TOGETHER, api_argument_spec, api_client)
+
+  module_args = api_argument_spec()
+  module_args.update(...)
+  module = AnsibleModule(argument_spec=module_args,
+                         mutually_exclusive=API_MUTUALLY_EXCLUSIVE,
+                         required_one_of=API_REQUIRED_ONE_OF,
+                         required_together=API_REQUIRED_TOGETHER)
+  st = api_client(module)
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import ApiClient
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_flight import SingleFlight
+
+API_MUTUALLY_EXCLUSIVE = [
+    ('token', 'login_user'),
+]
+API_REQUIRED_ONE_OF = [
+    ('token', 'login_user'),
+]
+API_REQUIRED_TOGETHER = [
+    ('login_user', 'login_pass'),
+]
+
+
+def api_argument_spec():
+    """ A new argument spec holding the authentication and request options """
+    return dict(
+        login_user=dict(type='str', required=False, no_log=True, aliases=['user', 'login_username']),
+        login_pass=dict(type='str', required=False, no_log=True, aliases=['pass', 'login_password']),
+        token=dict(type='str', required=False, no_log=True, aliases=['api_token']),
+        account=dict(type='str', required=True),
+        connect_timeout=dict(type='int', default=10),
+        read_timeout=dict(type='int', default=60),
+        deadline=dict(type='int', required=False),
+        api_retries=dict(type='int', default=0),
+        coalesce_reads=dict(type='bool', default=False),
+    )
+
+
+def api_client(module):
+    """ An ApiClient configured from the options of api_argument_spec() """
+    params = module.params
+    coalesce_dir = None
+    if params['coalesce_reads']:
+        coalesce_dir = SingleFlight.default_directory()
+    return ApiClient(
+        username=params['login_user'],
+        password=params['login_pass'],
+        token=params['token'],
+        account=params['account'],
+        connect_timeout=params['connect_timeout'],
+        read_timeout=params['read_timeout'],
+        deadline=params['deadline'],
+        retries=params['api_retries'],
+        coalesce=params['coalesce_reads'],
+        coalesce_dir=coalesce_dir)
@@ -0,0 +1,59 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Origin model for the StrikeTracker API."""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import JsonHandler
+
+
+class Origin:
+    optional_attrs = [
+        'id','type','createdDate','updatedDate','requestTimeoutSeconds',
+        'errorCacheTTLSeconds','maxRetryCount','authenticationType', 
+        'securePort','originPullHeaders','originCacheHeaders',
+        'verifyCertificate','certificateCN' 
+        ]
+
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+    def _get_attrs(self=None): 
+        return {'id','name','type','path','createdDate','updatedDate',
+                'requestTimeoutSeconds','errorCacheTTLSeconds','maxRetryCount',
+                'authenticationType','hostname','port','securePort',
+                'originPullHeaders','originCacheHeaders','verifyCertificate',
+                'certificateCN'}
+    def to_dict(self):
+        d = dict(
+                name=self.name,
+                port=self.port,
+                path=self.path,
+                hostname=self.hostname,
+                )
+        for a in [at for at in self.optional_attrs if hasattr(self, at)]:
+            d[a] = getattr(self, a)
+        return d
+    def requires_update(self,params):        
+        diff = dict()
+        for key,param in params.items():
+            if hasattr(self, key):
+                if param != getattr(self,key):
+                    diff[key] = param
+        return diff
+    def format_payload(self,updates=None):
+        crnt = self.to_dict()
+        strip_keys = ['id','createdDate','updatedDate']
+        payload = dict([(key, val) for key, val in
+                    crnt.items() if key not in strip_keys])
+        if updates is not None:
+            for key,val in updates.items():
+                payload[key] = val
+        return payload 
+
+JsonHandler.register(Origin, 40)
@@ -0,0 +1,102 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Platform, POP, billing region and documentation models for the
+StrikeTracker API."""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import JsonHandler
+
+
+class Platform:
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+    def _get_attrs(self=None): 
+        return {'id','code','name','capabilities','type','available'}
+    def to_dict(self):
+        return dict(
+                id=self.id,
+                code=self.code,
+                name=self.name,
+                capabilities=self.capabilities,
+                type=self.type,
+                available=self.available,
+                )
+
+class Notification:
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+    def _get_attrs(self=None): 
+        return {'id','createdDate','services','subject','subtitle'}
+    def to_dict(self):
+        return dict(
+                id=self.id,
+                createdDate=self.createdDate,
+                services=self.services,
+                subject=self.subject,
+                subtitle=self.subtitle,
+                )
+
+class Doc:
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+    def _get_attrs(self=None): 
+        return {'code','category','description'}
+    def to_dict(self):
+        return dict(
+                code=self.code,
+                categoy=self.category,
+                description=self.description,
+                )
+
+class BillingRegion:
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+    def _get_attrs(self=None): 
+        return {'id','code','name'}
+    def to_dict(self):
+        return dict(
+                id=self.id,
+                code=self.code,
+                name=self.name,
+                )
+
+class Pop:
+    def __init__(self, d=None):
+        if d is not None:
+            for k,v in d.items():
+                setattr(self, k, v)
+    def _get_attrs(self=None): 
+        return {'id','code','name','group','region','country',
+                'latitude','scannable','longitude','analyzable'}
+    def to_dict(self):
+        return dict(
+                id=self.id,
+                code=self.code,
+                name=self.name,
+                group=self.group,
+                region=self.region,
+                country=self.country,
+                latitude=self.latitude,
+                scannable=self.scannable,
+                longitude=self.longitude,
+                analyzable=self.analyzable
+                )
+
+JsonHandler.register(Pop, 50)
+JsonHandler.register(Platform, 60)
+JsonHandler.register(Notification, 70)
+JsonHandler.register(Doc, 80)
+JsonHandler.register(BillingRegion, 100)
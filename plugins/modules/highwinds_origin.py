@@ -18,22 +18,6 @@ version_added: "2.12.0"
 description: A module to manage Highwinds CDN Origins.
 
 options:
-    token:
-        description: Your Highwinds permanent API Token.
-        required: false
-        type: str
-    login_user:
-        description: Your Highwinds account username.
-        required: false
-        type: str
-    login_pass:
-        description: Your Highwinds account password.
-        required: false
-        type: str
-    account:
-        description: The hash ID for your Highwinds account.
-        required: true
-        type: str
     id:
         description: The ID of the Highwinds Origin.
         required: false
@@ -129,10 +113,22 @@ options:
         choices:
         - present
         - absent
-# Specify this value according to your collection
-# in format of namespace.collection.doc_fragment_name
-#extends_documentation_fragment:
-#    - sd_hardy.highwinds.my_doc_fragment_name
+    plan_file:
+        description:
+            - Path of a plan file on the host running the module.
+            - In check mode the change the module would make is written to
+              this file, along with the C(updatedDate) of the origin it
+              updates or deletes.
+            - Otherwise the saved change is applied without looking up the
+              origin again. The apply is refused if the origin has been
+              modified since the plan was written, or if the change is not
+              to the origin named by I(id), I(hostname) and I(state).
+            - A plan file that has been applied is marked as such, and
+              applying it again reports no change.
+        required: false
+        type: path
+extends_documentation_fragment:
+    - sd_hardy.highwinds.api
 author:
     - Skyler Hardy (https://github.com/sd-hardy)
 '''
@@ -175,6 +171,24 @@ EXAMPLES = r'''
     token: "{{ highwinds_api_token }}"
     id: "{{ my_origin1.id }}"
     state: absent
+
+# Record the change in check mode, then apply exactly that change
+- name: Plan origin update
+  sd_hardy.highwinds.highwinds_origin:
+    token: "{{ highwinds_api_token }}"
+    id: "{{ my_origin1.id }}"
+    hostname: origin1.example.com
+    port: 80
+    path: '/my/content'
+    plan_file: /tmp/my_origin1.plan
+  check_mode: true
+
+# The origin attributes are taken from the plan file
+- name: Apply origin update
+  sd_hardy.highwinds.highwinds_origin:
+    token: "{{ highwinds_api_token }}"
+    id: "{{ my_origin1.id }}"
+    plan_file: /tmp/my_origin1.plan
 '''
 
 RETURN = r'''
@@ -295,21 +309,17 @@ sample:
 
 from ansible.module_utils.basic import AnsibleModule
 
-import json
-import time
-from json import JSONDecodeError
-from ansible.module_utils.urls import open_url
-from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
-from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_api import ApiClient, ApiError, Origin
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import ApiError
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_module import (
+    API_MUTUALLY_EXCLUSIVE, API_REQUIRED_ONE_OF, API_REQUIRED_TOGETHER, api_argument_spec, api_client)
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_origin import Origin
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.origin_plan import OriginPlan
 #from ansible.highwinds.striketracker_api import ApiClient, ApiError, Origin
 
 
 def run_module():
-    module_args = dict(
-        login_user=dict(type='str', required=False, no_log=True, aliases=['user', 'login_username']),
-        login_pass=dict(type='str', required=False, no_log=True, aliases=['pass', 'login_password']),
-        token=dict(type='str', required=False, no_log=True, aliases=['api_token']),
-        account=dict(type='str', required=True),
+    module_args = api_argument_spec()
+    module_args.update(
         id=dict(type='int', required=False),
         name=dict(type='str', required=False),
         hostname=dict(type='str', required=False, aliases=['host']),
@@ -333,18 +343,14 @@ def run_module():
         password=dict(type='str', required=False, no_log=True, aliases=['basic_password', 'auth_password', 'basicAuthPass']),
         authenticationType=dict(type='str', default='NONE', choices=['NONE', 'BASIC']),
         state=dict(type='str', default='present', choices=['present', 'absent']),
+        plan_file=dict(type='path', required=False),
     )
 
     module = AnsibleModule(
         argument_spec=module_args,
-        mutually_exclusive=[
-            ('token', 'login_user'),
-        ],
-        required_one_of=[
-            ('token', 'login_user'),
-        ],
-        required_together=[
-            ('login_user', 'login_pass'),
+        mutually_exclusive=API_MUTUALLY_EXCLUSIVE,
+        required_one_of=API_REQUIRED_ONE_OF,
+        required_together=API_REQUIRED_TOGETHER + [
             ('hostname', 'port', 'path')
         ],
         required_if=[
@@ -362,13 +368,11 @@ def run_module():
     if module._diff:
         result['diff'] = dict()
 
-    token = module.params['token']
-    login_username = module.params['login_user']
-    login_password = module.params['login_pass']
     account = module.params['account']
     config = module.params['config']
     id = module.params['id']
     state = module.params['state']
+    plan_file = module.params['plan_file']
 
     # Handle building payload
     payload = None
@@ -377,17 +381,45 @@ def run_module():
     else:
         payload = dict()
         for key, param in module.params.items():
-            if (key not in ['token', 'login_user', 'login_pass',
-               'account', 'config', 'id', 'state']):
+            if (key not in api_argument_spec() and
+               key not in ['config', 'id', 'state', 'plan_file']):
                 if param is not None:
                     payload[key] = param
 
     try:
-        st = ApiClient(
-            username=login_username,
-            password=login_password,
-            token=token,
-            account=account)
+        st = api_client(module)
+
+        if plan_file is not None and not module.check_mode:
+            # Apply the reviewed change instead of looking the origin up again
+            plan = OriginPlan.load(plan_file, account)
+            targets = list(('present', o.id, getattr(o, 'hostname', None))
+                           for o, u in plan.updates)
+            targets += list(('present', None, p.get('hostname')) for p in plan.creates)
+            targets += list(('absent', o.id, getattr(o, 'hostname', None))
+                            for o in plan.deletes)
+            if len(targets) > 1:
+                raise ApiError("Plan file %s changes more than one origin" % plan_file)
+            for target_state, target_id, target_hostname in targets:
+                if (target_state != state
+                        or (id is not None and target_id != id)
+                        or ('hostname' in payload and target_hostname != payload['hostname'])):
+                    raise ApiError(
+                        "Plan file %s does not change the origin this task names: "
+                        "state=%s id=%s hostname=%s"
+                        % (plan_file, target_state, target_id, target_hostname))
+            if plan.applied:
+                return module.exit_json(**result)
+            plan.verify(st)
+            applied = plan.apply(st)
+            if applied['failed']:
+                raise ApiError('; '.join(applied['failed']))
+            plan.mark_applied(plan_file, account)
+            result['changed'] = plan.changed
+            for action in ['created', 'updated', 'deleted']:
+                if applied[action]:
+                    result['action'] = action
+                    result['origin'] = applied[action][0]
+            return module.exit_json(**result)
 
         origin = None
         if id is not None:
@@ -411,6 +443,8 @@ def run_module():
                 if updates:
                     result['changed'] = True
                     if module.check_mode:
+                        if plan_file is not None:
+                            OriginPlan(updates=[(origin, updates)]).save(plan_file, account)
                         if module._diff:
                             result['diff']['after'] = origin.to_dict() | updates
                         return module.exit_json(**result)
@@ -425,16 +459,22 @@ def run_module():
             if state == 'absent':
                 result['changed'] = True
                 if module.check_mode:
+                    if plan_file is not None:
+                        OriginPlan(deletes=[origin]).save(plan_file, account)
                     return module.exit_json(**result)
                 deleted = st.origins(origin_id=origin.id, method='DELETE')
                 if deleted is not None:
                     result['action'] = 'deleted'
                     result['origin'] = origin.to_dict()
+            if module.check_mode and plan_file is not None:
+                OriginPlan().save(plan_file, account)
             return module.exit_json(**result)
         else:
             if state == 'present' and payload is not None:
                 result['changed'] = True
                 if module.check_mode:
+                    if plan_file is not None:
+                        OriginPlan(creates=[Origin(payload).format_payload()]).save(plan_file, account)
                     return module.exit_json(**result)
                 created = st.origins(method='POST',
                                      config=Origin(payload).format_payload())
@@ -443,6 +483,8 @@ def run_module():
                     result['origin'] = created.to_dict()
                     if module._diff:
                         result['diff']['after'] = created.to_dict()
+            if module.check_mode and plan_file is not None:
+                OriginPlan().save(plan_file, account)
             return module.exit_json(**result)
     except Exception as exc:
         return module.fail_json(
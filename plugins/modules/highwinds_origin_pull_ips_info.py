@@ -0,0 +1,138 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: highwinds_origin_pull_ips_info
+
+short_description: highwinds_origin_pull_ips_info
+
+version_added: "0.1.0"
+
+description:
+    - Get the IP ranges Highwinds CDN edges pull from origins with.
+    - Overlapping and adjacent ranges are merged into the smallest list of CIDRs.
+    - When I(allowlist) is given, only the ranges to add to and remove from
+      it are returned, so firewall rules can be updated incrementally.
+
+options:
+    allowlist:
+        description:
+            - The CIDRs or addresses currently allowed by the local firewall.
+        required: false
+        type: list
+        elements: str
+extends_documentation_fragment:
+    - sd_hardy.highwinds.api
+author:
+    - Skyler Hardy (https://github.com/sd-hardy)
+'''
+
+EXAMPLES = r'''
+- name: Get the CDN origin pull ranges
+  sd_hardy.highwinds.highwinds_origin_pull_ips_info:
+    token: "{{ highwinds_api_token }}"
+    account: "{{ highwinds_account }}"
+  register: pull_ips
+
+- name: Work out the firewall changes
+  sd_hardy.highwinds.highwinds_origin_pull_ips_info:
+    token: "{{ highwinds_api_token }}"
+    account: "{{ highwinds_account }}"
+    allowlist: "{{ current_cdn_rules }}"
+  register: pull_ips
+
+- name: Allow new ranges
+  community.general.ufw:
+    rule: allow
+    port: '443'
+    src: "{{ item }}"
+  loop: "{{ pull_ips.added }}"
+
+- name: Drop ranges the CDN no longer uses
+  community.general.ufw:
+    rule: allow
+    port: '443'
+    src: "{{ item }}"
+    delete: true
+  loop: "{{ pull_ips.removed }}"
+'''
+
+RETURN = r'''
+ips:
+    description: The merged origin pull ranges.
+    type: list
+    elements: str
+    returned: always
+    sample: ["69.16.128.0/18", "2001:4de0::/32"]
+added:
+    description: Ranges the CDN uses that are not covered by the entries of I(allowlist) that are kept.
+    type: list
+    elements: str
+    returned: When I(allowlist) is given
+    sample: ["69.16.128.0/18"]
+removed:
+    description:
+        - Entries of I(allowlist), exactly as given, that are not entirely
+          inside the CDN ranges.
+        - Ranges of a removed entry that the CDN still uses are in I(added).
+    type: list
+    elements: str
+    returned: When I(allowlist) is given
+    sample: ["192.0.2.0/24"]
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import ApiError
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_module import (
+    API_MUTUALLY_EXCLUSIVE, API_REQUIRED_ONE_OF, API_REQUIRED_TOGETHER, api_argument_spec, api_client)
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_ip import IpList
+
+
+def run_module():
+    module_args = api_argument_spec()
+    module_args.update(
+        allowlist=dict(type='list', elements='str', required=False),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        mutually_exclusive=API_MUTUALLY_EXCLUSIVE,
+        required_one_of=API_REQUIRED_ONE_OF,
+        required_together=API_REQUIRED_TOGETHER,
+        supports_check_mode=True,
+    )
+
+    result = dict(
+        changed=False,
+        ips=list(),
+    )
+
+    try:
+        st = api_client(module)
+
+        ips = st.ip_whitelist()
+        if not hasattr(ips, 'list'):
+            raise ApiError("Unexpected origin pull IP response: %s" % ips)
+        if not isinstance(ips, IpList):
+            # An empty list is not recognised as an IP list when decoded
+            ips = IpList(dict(list=ips.list))
+        result['ips'] = ips.list
+        if module.params['allowlist'] is not None:
+            result.update(ips.diff(module.params['allowlist']))
+        return module.exit_json(**result)
+    except Exception as exc:
+        return module.fail_json(
+            msg='An error ocurred during module execution: %s' % str(exc), **result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
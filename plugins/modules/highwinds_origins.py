@@ -0,0 +1,338 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: highwinds_origins
+
+short_description: highwinds_origins
+
+version_added: "0.1.0"
+
+description:
+    - A module to reconcile the full set of Highwinds CDN Origins for an account.
+    - The current origins are fetched once and diffed against I(origins) to
+      build a create/update/delete plan, which is then applied with bounded
+      parallelism.
+    - Desired origins are matched to existing ones by C(id), then C(name),
+      then C(hostname).
+
+options:
+    origins:
+        description:
+            - The desired origins, with the same attributes as the options of
+              M(sd_hardy.highwinds.highwinds_origin).
+            - Origins that do not exist yet need at least C(name), C(hostname),
+              C(port) and C(path).
+            - Required unless applying a saved I(plan_file), and not allowed
+              when applying one.
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            id:
+                description: The ID of the Highwinds Origin.
+                type: int
+            name:
+                description: The name of the Highwinds Origin.
+                type: str
+            hostname:
+                description: The hostname of the Origin.
+                type: str
+                aliases: [host]
+            port:
+                description: The port to use for the Origin.
+                type: int
+            securePort:
+                description: The SSL enabled port to use for the Origin.
+                type: int
+            type:
+                description: The origin's type (defaults to EXTERNAL for external origins)
+                type: str
+                default: EXTERNAL
+            path:
+                description: The path to prepend requests
+                type: str
+                aliases: [uri]
+            requestTimeoutSeconds:
+                description: The time before the request times out, in seconds.
+                type: int
+            errorCacheTTLSeconds:
+                description: Time in seconds to cache errors.
+                type: int
+            maximumOriginPullSeconds:
+                description: Time in seconds in which we give up attempting to pull an asset
+                type: int
+            maxRequestsPerConnection:
+                description: The maximum Requests Per Connection
+                type: int
+            maxConnectionsPerEdge:
+                description: If enabled, the maximum number of concurrent connection any single edge will make to the origin
+                type: int
+            maxConnectionsPerEdgeEnabled:
+                description: Indicates if the CDN should limit the number of connections each edge should make when pulling content
+                type: bool
+            maxRetryCount:
+                description: How many times we attempt to pull the asset before giving up
+                type: int
+            authenticationType:
+                description: The authentication type to use for origin requests
+                type: str
+                default: NONE
+                choices:
+                - NONE
+                - BASIC
+            username:
+                description: The username for basic authentication
+                type: str
+                aliases: [basic_username, auth_username, basicAuthUser]
+            password:
+                description: The password for basic authentication
+                type: str
+                aliases: [basic_password, auth_password, basicAuthPass]
+            originPullHeaders:
+                description: Headers to add when pulling from this origin
+                type: str
+            originCacheHeaders:
+                description: Headers to preserve in cached responses
+                type: str
+            verifyCertificate:
+                description: If we should verify the Origins SSL certificate.
+                type: bool
+            certificateCN:
+                description: The certificate common name.
+                type: str
+    exclusive:
+        description:
+            - When true, I(origins) is authoritative and any origin in the
+              account that is not listed is deleted.
+            - An empty I(origins) list is refused unless I(allow_empty) is set.
+        required: false
+        default: false
+        type: bool
+    allow_empty:
+        description:
+            - Allow an empty I(origins) list with I(exclusive), which deletes
+              every origin in the account.
+        required: false
+        default: false
+        type: bool
+    parallelism:
+        description:
+            - The maximum number of API writes to run at the same time.
+            - Deletes are only started after all creates and updates succeeded.
+        required: false
+        default: 4
+        type: int
+    plan_file:
+        description:
+            - Path of a plan file on the host running the module.
+            - In check mode the computed plan is written to this file, along
+              with the C(updatedDate) of every origin it updates or deletes.
+            - Otherwise the saved plan is applied as-is, without diffing
+              I(origins) again. The apply is refused if any planned origin
+              has been modified since the plan was written.
+            - A plan file that has been applied is marked as such, and
+              applying it again reports no change.
+        required: false
+        type: path
+extends_documentation_fragment:
+    - sd_hardy.highwinds.api
+author:
+    - Skyler Hardy (https://github.com/sd-hardy)
+'''
+
+EXAMPLES = r'''
+# Make the account contain exactly these two origins
+- name: Reconcile Highwinds origins
+  sd_hardy.highwinds.highwinds_origins:
+    token: "{{ highwinds_api_token }}"
+    account: "{{ highwinds_account }}"
+    exclusive: true
+    origins:
+      - name: MyOrigin1
+        hostname: origin1.example.com
+        port: 80
+        path: '/'
+      - name: MyOrigin2
+        hostname: origin2.example.com
+        port: 80
+        path: '/content'
+        verifyCertificate: true
+  register: reconcile
+
+# Show what would change without touching the account
+- name: Plan origin changes
+  sd_hardy.highwinds.highwinds_origins:
+    token: "{{ highwinds_api_token }}"
+    account: "{{ highwinds_account }}"
+    exclusive: true
+    origins: "{{ my_origins }}"
+  check_mode: true
+  register: plan
+
+# Review a plan in one run and apply exactly that plan in a later one
+- name: Write origin plan
+  sd_hardy.highwinds.highwinds_origins:
+    token: "{{ highwinds_api_token }}"
+    account: "{{ highwinds_account }}"
+    exclusive: true
+    origins: "{{ my_origins }}"
+    plan_file: /tmp/origins.plan
+  check_mode: true
+
+- name: Apply origin plan
+  sd_hardy.highwinds.highwinds_origins:
+    token: "{{ highwinds_api_token }}"
+    account: "{{ highwinds_account }}"
+    plan_file: /tmp/origins.plan
+'''
+
+RETURN = r'''
+plan:
+    description: The computed changes.
+    type: complex
+    returned: always
+    sample: {
+        "create": [],
+        "update": [{"id": 123456, "name": "MyOrigin1", "changes": {"path": "/"}}],
+        "delete": [{"id": 123457, "name": "OldOrigin"}]
+    }
+    contains:
+        create:
+            description: Payloads of the origins to create.
+            type: list
+            elements: dict
+        update:
+            description: The id, name and changed attributes of each origin to update.
+            type: list
+            elements: dict
+        delete:
+            description: The id and name of each origin to delete.
+            type: list
+            elements: dict
+created:
+    description: The origins that were created.
+    type: list
+    elements: dict
+    returned: When not in check mode
+updated:
+    description: The origins after they were updated.
+    type: list
+    elements: dict
+    returned: When not in check mode
+deleted:
+    description: The origins that were deleted.
+    type: list
+    elements: dict
+    returned: When not in check mode
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_module import (
+    API_MUTUALLY_EXCLUSIVE, API_REQUIRED_ONE_OF, API_REQUIRED_TOGETHER, api_argument_spec, api_client)
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.origin_plan import OriginPlan
+
+
+def run_module():
+    # Same attributes and no_log settings as highwinds_origin
+    origin_args = dict(
+        id=dict(type='int', required=False),
+        name=dict(type='str', required=False),
+        hostname=dict(type='str', required=False, aliases=['host']),
+        port=dict(type='int', required=False),
+        type=dict(type='str', required=False, default='EXTERNAL'),
+        path=dict(type='str', required=False, aliases=['uri']),
+        originPullHeaders=dict(type='str', required=False),
+        originCacheHeaders=dict(type='str', required=False),
+        certificateCN=dict(type='str', required=False),
+        requestTimeoutSeconds=dict(type='int', required=False),
+        errorCacheTTLSeconds=dict(type='int', required=False),
+        maxRetryCount=dict(type='int', required=False),
+        securePort=dict(type='int', required=False),
+        maximumOriginPullSeconds=dict(type='int', required=False),
+        maxRequestsPerConnection=dict(type='int', required=False),
+        maxConnectionsPerEdge=dict(type='int', required=False),
+        maxConnectionsPerEdgeEnabled=dict(type='bool', required=False),
+        verifyCertificate=dict(type='bool', required=False),
+        username=dict(type='str', required=False, no_log=True, aliases=['basic_username', 'auth_username','basicAuthUser']),
+        password=dict(type='str', required=False, no_log=True, aliases=['basic_password', 'auth_password', 'basicAuthPass']),
+        authenticationType=dict(type='str', default='NONE', choices=['NONE', 'BASIC']),
+    )
+    module_args = api_argument_spec()
+    module_args.update(
+        origins=dict(type='list', elements='dict', required=False, options=origin_args),
+        exclusive=dict(type='bool', default=False),
+        allow_empty=dict(type='bool', default=False),
+        parallelism=dict(type='int', default=4),
+        plan_file=dict(type='path', required=False),
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        mutually_exclusive=API_MUTUALLY_EXCLUSIVE,
+        required_one_of=API_REQUIRED_ONE_OF + [
+            ('origins', 'plan_file'),
+        ],
+        required_together=API_REQUIRED_TOGETHER,
+        supports_check_mode=True,
+    )
+
+    result = dict(
+        changed=False,
+        plan=dict(),
+    )
+
+    account = module.params['account']
+    plan_file = module.params['plan_file']
+    if module.check_mode and module.params['origins'] is None:
+        module.fail_json(msg='origins is required to compute a plan', **result)
+    if not module.check_mode and plan_file is not None and module.params['origins'] is not None:
+        module.fail_json(msg='origins cannot be given when applying a plan_file', **result)
+
+    try:
+        st = api_client(module)
+
+        if plan_file is not None and not module.check_mode:
+            # Apply the reviewed plan instead of diffing again
+            plan = OriginPlan.load(plan_file, account)
+            if plan.applied:
+                result['plan'] = OriginPlan().to_dict()
+                return module.exit_json(**result)
+            plan.verify(st)
+        else:
+            plan = OriginPlan.build(st.origins(),
+                                    module.params['origins'],
+                                    exclusive=module.params['exclusive'],
+                                    allow_empty=module.params['allow_empty'])
+            if plan_file is not None:
+                plan.save(plan_file, account)
+        result['plan'] = plan.to_dict()
+        result['changed'] = plan.changed
+        if module.check_mode or not plan.changed:
+            return module.exit_json(**result)
+
+        applied = plan.apply(st, parallelism=module.params['parallelism'])
+        failed = applied.pop('failed')
+        result.update(applied)
+        if failed:
+            return module.fail_json(
+                msg='Unable to apply origin plan: %s' % '; '.join(failed), **result)
+        if plan_file is not None:
+            plan.mark_applied(plan_file, account)
+        return module.exit_json(**result)
+    except Exception as exc:
+        return module.fail_json(
+            msg='An error ocurred during module execution: %s' % str(exc), **result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Benchmark request payload and model serialization.
+
+Compares the previous path, which parsed every payload with json.loads to
+check whether it was already JSON before calling json.dumps, with the
+single pass encoders in striketracker_json:
+
+  python tests/benchmarks/bench_payload.py --origins 1000 --repeat 5
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import json
+import timeit
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_api import JsonHandler
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_json import BACKEND, dumps, encode_payload
+
+from loadtest import make_host, make_origin
+
+
+def legacy_payload(config):
+    # ApiClient._is_json followed by ApiClient._to_json
+    try:
+        json.loads(config)
+    except (TypeError, ValueError):
+        config = json.dumps(config)
+    return config.encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--origins', type=int, default=1000)
+    parser.add_argument('--hosts', type=int, default=100)
+    parser.add_argument('--scopes', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    origins = json.loads(json.dumps(dict(list=list(make_origin(i) for i in range(args.origins)))),
+                         object_hook=JsonHandler.find_class).list
+    hosts = json.loads(json.dumps(dict(list=list(make_host(i, args.scopes, 3) for i in range(args.hosts)))),
+                       object_hook=JsonHandler.find_class).list
+    payloads = list(o.format_payload(dict(path='/changed')) for o in origins)
+    configs = list(json.dumps(p) for p in payloads)
+
+    cases = [
+        ('origin payloads',
+         lambda: [legacy_payload(p) for p in payloads],
+         lambda: [encode_payload(p) for p in payloads]),
+        ('config strings',
+         lambda: [legacy_payload(c) for c in configs],
+         lambda: [encode_payload(c) for c in configs]),
+        ('origin models',
+         lambda: [json.dumps(o.to_dict()).encode('utf-8') for o in origins],
+         lambda: [dumps(o) for o in origins]),
+        ('hosts',
+         lambda: [json.dumps(h.to_dict()) for h in hosts],
+         lambda: [h.to_json() for h in hosts]),
+    ]
+
+    print('backend: %s' % BACKEND)
+    print('%-16s %12s %12s %8s' % ('case', 'before (s)', 'after (s)', 'speedup'))
+    for name, before, after in cases:
+        t_before = min(timeit.repeat(before, number=1, repeat=args.repeat))
+        t_after = min(timeit.repeat(after, number=1, repeat=args.repeat))
+        print('%-16s %12.4f %12.4f %7.2fx' % (name, t_before, t_after, t_before / t_after))
+
+
+if __name__ == '__main__':
+    main()
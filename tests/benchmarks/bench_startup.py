@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Benchmark module startup time and AnsiballZ payload size.
+
+For every module the collection's module_utils it imports are resolved the
+way AnsiballZ does, by following import statements, and their compressed
+size is reported. Startup is the time to import the module in a fresh
+interpreter after ansible.module_utils.basic and urls, which every module
+loads anyway. AnsiballZ runs modules from a zip file, so the collection's
+code is compiled from source every time; the child interpreters import it
+from a temporary copy with -B to measure the same. The "all models" columns
+add the striketracker_api import, which gives what a module shipped and
+imported before the models were split out:
+
+  python tests/benchmarks/bench_startup.py --repeat 20
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import ast
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zlib
+
+PREFIX = 'ansible_collections.sd_hardy.highwinds.plugins.'
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+API = PREFIX + 'module_utils.striketracker_api'
+
+IMPORT_TIME = '''
+import time
+import importlib
+import ansible.module_utils.basic
+import ansible.module_utils.urls
+start = time.perf_counter()
+for name in %r:
+    importlib.import_module(name)
+print(time.perf_counter() - start)
+'''
+
+
+def path_of(name):
+    return os.path.join(ROOT, 'plugins', *name[len(PREFIX):].split('.')) + '.py'
+
+
+def closure(name):
+    """ The collection files AnsiballZ packs for module or module_util `name` """
+    seen, todo = set(), [name]
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        with open(path_of(name)) as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith(PREFIX):
+                todo.append(node.module)
+            elif isinstance(node, ast.Import):
+                todo.extend(a.name for a in node.names if a.name.startswith(PREFIX))
+    return seen
+
+
+def payload_size(files):
+    raw = b''
+    for f in sorted(files):
+        with open(path_of(f), 'rb') as fh:
+            raw += fh.read()
+    return len(zlib.compress(raw, 6))
+
+
+def startup(names, repeat):
+    # A copy without bytecode that -B keeps that way, so every run compiles
+    # the collection while the stdlib and ansible use their usual caches
+    tmp = tempfile.mkdtemp(prefix='bench-startup-')
+    try:
+        shutil.copytree(os.path.join(ROOT, 'plugins'),
+                        os.path.join(tmp, 'ansible_collections', 'sd_hardy', 'highwinds', 'plugins'),
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        path = os.pathsep.join(p for p in [tmp, os.environ.get('PYTHONPATH')] if p)
+        env = dict(os.environ, PYTHONPATH=path)
+        times = list()
+        for _ in range(repeat):
+            out = subprocess.check_output([sys.executable, '-B', '-c', IMPORT_TIME % (names,)], env=env)
+            times.append(float(out.decode().strip()))
+    finally:
+        shutil.rmtree(tmp)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='fresh interpreters per module, the fastest is reported')
+    args = parser.parse_args()
+
+    modules = sorted(f[:-3] for f in os.listdir(os.path.join(ROOT, 'plugins', 'modules'))
+                     if f.endswith('.py'))
+    print('%-32s %20s %20s %20s' % ('', 'payload (bytes)', 'startup (ms)', 'reduction'))
+    print('%-32s %9s %10s %9s %10s %9s %10s' % (
+        'module', 'split', 'all models', 'split', 'all models', 'payload', 'startup'))
+    for module in modules:
+        name = PREFIX + 'modules.' + module
+        files = closure(name)
+        split, monolithic = payload_size(files), payload_size(files | closure(API))
+        t_split = startup([name], args.repeat)
+        t_monolithic = startup([name, API], args.repeat)
+        print('%-32s %9d %10d %9.2f %10.2f %8.1f%% %9.1f%%' % (
+            module, split, monolithic, t_split * 1000, t_monolithic * 1000,
+            100.0 * (monolithic - split) / monolithic,
+            100.0 * (t_monolithic - t_split) / t_monolithic))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Scale test for the striketracker_api decoding and lookup paths.
+
+Synthetic StrikeTracker payloads of growing size are pushed through the same
+code the modules use, and each phase is timed at every size:
+
+  decode     json.loads with JsonHandler.find_class (origins, hosts, IP list)
+  lookup     the hostname scan done by highwinds_origin, and ScopeIndex.match
+  diff       Origin.requires_update and OriginPlan.build
+  serialize  List.to_dict, Host.to_dict and json.dumps of the results
+
+The report lists the time and peak memory of every phase per size, and the
+growth exponent between consecutive sizes (1.0 is linear). Phases that grow
+faster than --threshold are flagged.
+
+The collection must be importable, e.g. run from a collections path:
+
+  python tests/benchmarks/loadtest.py --sizes 100 1000 10000 100000 \\
+      --report scaling.json --profile-dir profiles/
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import cProfile
+import json
+import math
+import os
+import random
+import time
+import tracemalloc
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_api import JsonHandler
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.origin_plan import OriginPlan
+
+
+DATE = '2022-01-01 13:01:20'
+
+
+def make_origin(i):
+    return dict(
+        id=i,
+        name='origin-%d' % i,
+        type='EXTERNAL',
+        path='/content/%d' % (i % 50),
+        createdDate=DATE,
+        updatedDate=DATE,
+        requestTimeoutSeconds=30,
+        errorCacheTTLSeconds=5,
+        maxRetryCount=3,
+        authenticationType='NONE',
+        hostname='origin%d.example.com' % i,
+        port=80,
+        securePort=443,
+        originPullHeaders='Host: origin%d.example.com' % i,
+        originCacheHeaders='Access-Control-Allow-Origin',
+        verifyCertificate=bool(i % 2),
+        certificateCN='origin%d.example.com' % i,
+    )
+
+
+def make_host(i, scopes, services):
+    return dict(
+        name='host-%d' % i,
+        hashCode='h%08x' % i,
+        type='HOST',
+        createdDate=DATE,
+        updatedDate=DATE,
+        services=list(dict(id=s, name='service-%d' % s, description='', type='CDN')
+                      for s in range(services)),
+        scopes=list(dict(id=i * scopes + s,
+                         platform=['CDS', 'CDI', 'ALL'][s % 3],
+                         path='/' + '/'.join('p%d' % d for d in range(s % 6)),
+                         name='scope-%d' % s,
+                         createdDate=DATE,
+                         updatedDate=DATE)
+                    for s in range(scopes)),
+    )
+
+
+def make_ip(i):
+    return '%d.%d.%d.0/24' % (10 + (i >> 16) % 200, (i >> 8) & 255, i & 255)
+
+
+def generate(size, scopes, services):
+    """ Build the raw JSON bodies for an account of `size` origins """
+    hosts = max(1, size // 10)
+    return dict(
+        origins=json.dumps(dict(list=list(make_origin(i) for i in range(size)))),
+        hosts=json.dumps(dict(list=list(make_host(i, scopes, services)
+                                        for i in range(hosts)))),
+        ips=json.dumps(dict(list=list(make_ip(i) for i in range(size)))),
+    )
+
+
+def decode(body):
+    return json.loads(body, object_hook=JsonHandler.find_class)
+
+
+def phases(payloads, lookups):
+    """ Yield (phase, callable) pairs sharing state through `ctx` """
+    ctx = dict()
+    rng = random.Random(0)
+
+    def decode_all():
+        ctx['origins'] = decode(payloads['origins'])
+        ctx['hosts'] = decode(payloads['hosts'])
+        ctx['ips'] = decode(payloads['ips'])
+        n = len(ctx['origins'].list)
+        ctx['targets'] = list('origin%d.example.com' % rng.randrange(n)
+                              for _ in range(lookups))
+
+    def lookup():
+        # The scan highwinds_origin does for every task without an id
+        for hostname in ctx['targets']:
+            for o in ctx['origins'].list:
+                if o.hostname == hostname:
+                    break
+        for host in ctx['hosts'].list:
+            host.scope_index.match('/p0/p1/p2/p3/asset.js')
+
+    def diff():
+        desired = list()
+        for o in ctx['origins'].list:
+            params = dict(name=o.name, hostname=o.hostname, port=o.port,
+                          path='/changed' if o.id % 10 == 0 else o.path)
+            o.requires_update(params)
+            desired.append(params)
+        ctx['plan'] = OriginPlan.build(ctx['origins'], desired, exclusive=True)
+
+    def serialize():
+        json.dumps(ctx['origins'].to_dict())
+        json.dumps(list(h.to_dict() for h in ctx['hosts'].list))
+        json.dumps(ctx['ips'].to_dict())
+        json.dumps(ctx['plan'].to_dict())
+
+    return [('decode', decode_all), ('lookup', lookup),
+            ('diff', diff), ('serialize', serialize)]
+
+
+def measure(size, args):
+    payloads = generate(size, args.scopes, args.services)
+    results = dict()
+    for name, fn in phases(payloads, args.lookups):
+        profiler = cProfile.Profile() if args.profile_dir else None
+        if args.memory:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(
+                args.profile_dir, '%s-%d.prof' % (name, size)))
+        peak = None
+        if args.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results[name] = dict(seconds=elapsed, peak_bytes=peak)
+    return results
+
+
+def exponent(small, large, t_small, t_large):
+    if t_small <= 0 or t_large <= 0:
+        return None
+    return math.log(t_large / t_small) / math.log(large / small)
+
+
+def report(sizes, results, threshold):
+    rows, flagged = list(), list()
+    for name in ['decode', 'lookup', 'diff', 'serialize']:
+        previous = None
+        for size in sizes:
+            r = results[size][name]
+            row = dict(phase=name, size=size, seconds=r['seconds'],
+                       peak_bytes=r['peak_bytes'], exponent=None)
+            if previous is not None:
+                row['exponent'] = exponent(previous['size'], size,
+                                           previous['seconds'], r['seconds'])
+                if row['exponent'] is not None and row['exponent'] > threshold:
+                    flagged.append(row)
+            rows.append(row)
+            previous = row
+    return rows, flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100, 1000, 10000, 100000],
+                        help='number of origins (and IP ranges) per run; '
+                             'hosts are a tenth of that')
+    parser.add_argument('--scopes', type=int, default=20, help='scopes per host')
+    parser.add_argument('--services', type=int, default=3, help='services per host')
+    parser.add_argument('--lookups', type=int, default=100,
+                        help='hostname lookups in the lookup phase')
+    parser.add_argument('--threshold', type=float, default=1.3,
+                        help='growth exponent above which a phase is flagged')
+    parser.add_argument('--memory', action='store_true',
+                        help='record peak memory with tracemalloc (slower)')
+    parser.add_argument('--profile-dir',
+                        help='write a cProfile dump per phase and size here')
+    parser.add_argument('--report', help='write the scaling report as JSON here')
+    args = parser.parse_args()
+
+    if args.profile_dir and not os.path.isdir(args.profile_dir):
+        os.makedirs(args.profile_dir)
+    sizes = sorted(args.sizes)
+    results = dict((size, measure(size, args)) for size in sizes)
+    rows, flagged = report(sizes, results, args.threshold)
+
+    print('%-10s %8s %12s %14s %9s' % ('phase', 'size', 'seconds', 'peak bytes', 'exponent'))
+    for row in rows:
+        print('%-10s %8d %12.4f %14s %9s' % (
+            row['phase'], row['size'], row['seconds'],
+            '-' if row['peak_bytes'] is None else row['peak_bytes'],
+            '-' if row['exponent'] is None else '%.2f' % row['exponent']))
+    for row in flagged:
+        print('super-linear: %s grows with exponent %.2f up to %d'
+              % (row['phase'], row['exponent'], row['size']))
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(dict(threshold=args.threshold, rows=rows,
+                           flagged=flagged), f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import threading
+
+import pytest
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.origin_plan import OriginPlan
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import ApiError, List
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_origin import Origin
+
+
+def origin(id, name, hostname='origin.example.com', path='/', updated='2022-01-01T00:00:00Z'):
+    return Origin(dict(id=id, name=name, hostname=hostname, port=80, path=path,
+                       updatedDate=updated))
+
+
+class FakeClient:
+    """ Serves st.origins() from a dict and records the requests """
+
+    def __init__(self, origins, fail=None):
+        # Copies, so changes on the server side do not leak into the plan
+        self.origins_by_id = dict((o.id, Origin(dict(o.__dict__))) for o in origins)
+        self.fail = fail if fail is not None else dict()
+        self.calls = list()
+        self.next_id = 1000
+        self._lock = threading.Lock()
+
+    def origins(self, method='GET', origin_id=None, config=None, deadline=None):
+        with self._lock:
+            self.calls.append((method, origin_id))
+        error = self.fail.get((method, origin_id))
+        if error is not None:
+            raise error
+        if method == 'GET' and origin_id is None:
+            return List(dict(list=list(self.origins_by_id.values())))
+        if method == 'GET':
+            return self.origins_by_id.get(origin_id)
+        if method == 'POST':
+            with self._lock:
+                self.next_id += 1
+                created = Origin(dict(config, id=self.next_id))
+            self.origins_by_id[created.id] = created
+            return created
+        if method == 'PUT':
+            updated = Origin(dict(config, id=origin_id, updatedDate='2022-02-02T00:00:00Z'))
+            self.origins_by_id[origin_id] = updated
+            return updated
+        del self.origins_by_id[origin_id]
+        return dict()
+
+
+@pytest.fixture
+def current():
+    return List(dict(list=[origin(1, 'one', 'one.example.com'),
+                           origin(2, 'two', 'two.example.com'),
+                           origin(3, 'three', 'shared.example.com'),
+                           origin(4, 'four', 'shared.example.com')]))
+
+
+def test_build_matches_by_id_name_and_hostname(current):
+    plan = OriginPlan.build(current, [
+        dict(id=1, path='/one'),
+        dict(name='two', path='/'),
+        dict(hostname='shared.example.com', path='/shared', name=None),
+        dict(name='five', hostname='five.example.com', port=80, path='/'),
+    ])
+    assert [(o.id, u) for o, u in plan.updates] == [(1, dict(path='/one')), (3, dict(path='/shared'))]
+    assert plan.creates == [dict(name='five', hostname='five.example.com', port=80, path='/')]
+    assert plan.deletes == []
+    assert plan.changed
+
+
+def test_build_exclusive_deletes_unclaimed(current):
+    plan = OriginPlan.build(current, [dict(name='one'), dict(name='two')], exclusive=True)
+    assert plan.updates == []
+    assert sorted(o.id for o in plan.deletes) == [3, 4]
+
+
+def test_build_unchanged(current):
+    plan = OriginPlan.build(current, [dict(name='one', path='/')])
+    assert not plan.changed
+    assert plan.to_dict() == dict(create=[], update=[], delete=[])
+
+
+@pytest.mark.parametrize('desired, msg', [
+    ([dict(id=9)], 'Origin with id 9 does not exist'),
+    ([dict(name='one'), dict(id=1)], 'matched by more than one desired origin'),
+    ([dict(name='new', hostname='new.example.com')], 'missing: port, path'),
+])
+def test_build_errors(current, desired, msg):
+    with pytest.raises(ApiError) as e:
+        OriginPlan.build(current, desired)
+    assert msg in e.value.msg
+
+
+def test_build_refuses_empty_exclusive(current):
+    with pytest.raises(ApiError):
+        OriginPlan.build(current, [], exclusive=True)
+    plan = OriginPlan.build(current, [], exclusive=True, allow_empty=True)
+    assert len(plan.deletes) == 4
+
+
+def test_save_load_roundtrip(current, tmp_path):
+    path = str(tmp_path / 'origins.plan')
+    plan = OriginPlan.build(current, [
+        dict(name='one', path='/one'),
+        dict(name='five', hostname='five.example.com', port=80, path='/'),
+    ], exclusive=True)
+    plan.save(path, 'acct')
+    assert os.stat(path).st_mode & 0o077 == 0
+
+    loaded = OriginPlan.load(path, 'acct')
+    assert loaded.to_dict() == plan.to_dict()
+    assert [o.updatedDate for o, u in loaded.updates] == ['2022-01-01T00:00:00Z']
+    assert loaded.updates[0][0].format_payload(loaded.updates[0][1])['path'] == '/one'
+
+
+def test_load_rejects_other_account(current, tmp_path):
+    path = str(tmp_path / 'origins.plan')
+    OriginPlan.build(current, [dict(name='one', path='/one')]).save(path, 'acct')
+    with pytest.raises(ApiError) as e:
+        OriginPlan.load(path, 'other')
+    assert 'written for account acct' in e.value.msg
+
+
+def test_verify_small_plan_by_id(current):
+    st = FakeClient(current.list)
+    plan = OriginPlan.build(current, [dict(name='one', path='/one')])
+    plan.verify(st)
+    assert st.calls == [('GET', 1)]
+
+
+def test_verify_creates_fetch_list(current):
+    st = FakeClient(current.list)
+    plan = OriginPlan.build(current, [dict(name='one', path='/one'),
+                                      dict(name='six', hostname='x', port=80, path='/')])
+    plan.verify(st)
+    assert st.calls == [('GET', None)]
+
+
+@pytest.mark.parametrize('change, msg', [
+    (lambda st: st.origins_by_id.pop(1), 'no longer exists'),
+    (lambda st: setattr(st.origins_by_id[1], 'updatedDate', 'later'), 'was updated at later'),
+])
+def test_verify_stale(current, change, msg):
+    st = FakeClient(current.list)
+    plan = OriginPlan.build(current, [dict(name='one', path='/one')])
+    change(st)
+    with pytest.raises(ApiError) as e:
+        plan.verify(st)
+    assert msg in e.value.msg
+
+
+def test_verify_stale_create(current):
+    plan = OriginPlan.build(current, [dict(name='five', hostname='x', port=80, path='/')])
+    st = FakeClient(current.list + [origin(5, 'five')])
+    with pytest.raises(ApiError) as e:
+        plan.verify(st)
+    assert 'five already exists' in e.value.msg
+
+
+def test_apply(current):
+    st = FakeClient(current.list)
+    plan = OriginPlan.build(current, [
+        dict(name='one', path='/one'),
+        dict(name='two'),
+        dict(name='five', hostname='five.example.com', port=80, path='/'),
+    ], exclusive=True)
+    results = plan.apply(st, parallelism=2)
+    assert results['failed'] == []
+    assert [o['name'] for o in results['created']] == ['five']
+    assert [o['path'] for o in results['updated']] == ['/one']
+    assert sorted(o['id'] for o in results['deleted']) == [3, 4]
+    assert sorted(o.name for o in st.origins_by_id.values()) == ['five', 'one', 'two']
+
+
+def test_apply_skips_deletes_after_failed_write(current):
+    st = FakeClient(current.list, fail={('PUT', 1): ApiError('boom'),
+                                        ('POST', None): ValueError('bad')})
+    plan = OriginPlan.build(current, [
+        dict(name='one', path='/one'),
+        dict(name='two', path='/two'),
+        dict(name='five', hostname='five.example.com', port=80, path='/'),
+    ], exclusive=True)
+    results = plan.apply(st)
+    assert sorted(results['failed']) == ['bad', 'boom']
+    assert [o['path'] for o in results['updated']] == ['/two']
+    assert results['deleted'] == []
+    assert 'DELETE' not in [m for m, i in st.calls]
+
+
+def test_mark_applied(current, tmp_path):
+    path = str(tmp_path / 'origins.plan')
+    OriginPlan.build(current, [dict(name='one', path='/one')]).save(path, 'acct')
+    plan = OriginPlan.load(path, 'acct')
+    assert not plan.applied
+    plan.mark_applied(path, 'acct')
+
+    loaded = OriginPlan.load(path, 'acct')
+    assert loaded.applied
+    assert loaded.to_dict() == plan.to_dict()
+
+
+def test_apply_records_unexpected_responses(current, monkeypatch):
+    st = FakeClient(current.list)
+    responses = {1: None, 2: dict(id=2)}
+    original = st.origins
+
+    def origins(method='GET', origin_id=None, config=None, deadline=None):
+        result = original(method, origin_id, config, deadline)
+        return responses.get(origin_id, result) if method == 'PUT' else result
+
+    monkeypatch.setattr(st, 'origins', origins)
+    plan = OriginPlan.build(current, [dict(name='one', path='/one'),
+                                      dict(name='two', path='/two'),
+                                      dict(name='three', path='/three')])
+    results = plan.apply(st)
+    assert [o['path'] for o in results['updated']] == ['/three']
+    assert results['failed'][0] == 'No origin in the API response to update'
+    assert len(results['failed']) == 2
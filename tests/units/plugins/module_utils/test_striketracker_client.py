@@ -0,0 +1,246 @@
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible.module_utils.six.moves.urllib.parse import parse_qs
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils import striketracker_client
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import ApiClient, ApiError
+
+TOKEN_URL = 'https://striketracker.highwinds.com/auth/token'
+
+
+class FakeApi:
+    """ Stands in for open_url: a token endpoint and one API resource """
+
+    def __init__(self, expires_in=3600, delay=0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.grants = list()
+        self.revoked = set()
+        self.refresh_fails = False
+        self.issued = 0
+        # Errors raised by the next API (not token) requests, in order
+        self.failures = list()
+        self.timeouts = list()
+        self._lock = threading.Lock()
+
+    def __call__(self, url, method='GET', data=None, headers=None, http_agent=None, timeout=None):
+        if self.delay:
+            time.sleep(self.delay)
+        self.timeouts.append(timeout)
+        if url == TOKEN_URL:
+            return self.token(url, parse_qs(data.decode()))
+        if self.failures:
+            raise self.failures.pop(0)
+        token = headers['Authorization'].split(' ', 1)[1]
+        if token in self.revoked:
+            raise HTTPError(url, 401, 'Unauthorized', dict(), io.BytesIO(b'{}'))
+        return io.BytesIO(json.dumps(dict(token=token)).encode())
+
+    def token(self, url, form):
+        with self._lock:
+            self.grants.append(dict((k, v[0]) for k, v in form.items()))
+            if form['grant_type'] == ['refresh_token'] and self.refresh_fails:
+                raise HTTPError(url, 400, 'Bad Request', dict(),
+                                io.BytesIO(b'{"error": "invalid_grant"}'))
+            self.issued += 1
+            response = dict(access_token='token-%d' % self.issued,
+                            refresh_token='refresh-%d' % self.issued,
+                            expires_in=self.expires_in)
+        return io.BytesIO(json.dumps(response).encode())
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeApi()
+    monkeypatch.setattr(striketracker_client, 'open_url', fake)
+    return fake
+
+
+@pytest.fixture
+def client(api):
+    st = ApiClient(username='user@example.com', password='p&ss=w+rd', account='acct')
+    yield st
+    st.close()
+
+
+def get(st):
+    return json.loads(st.request('GET', st.apiurl + '/origins'))['token']
+
+
+def test_password_grant(api, client):
+    assert api.grants == [dict(grant_type='password', username='user@example.com',
+                               password='p&ss=w+rd')]
+    assert client.token == 'token-1'
+    assert client.refresh_token == 'refresh-1'
+    assert client.renew_at == client.expires_at - client.refresh_margin
+    assert get(client) == 'token-1'
+
+
+def test_renews_with_refresh_token_before_expiry(api, client):
+    client.renew_at = time.monotonic() - 1
+    assert get(client) == 'token-2'
+    assert api.grants[-1] == dict(grant_type='refresh_token', refresh_token='refresh-1')
+    assert len(api.grants) == 2
+
+
+def test_short_lived_token_renews_halfway(api):
+    api.expires_in = 30
+    st = ApiClient(username='user', password='pass', account='acct')
+    try:
+        assert st.expires_at - st.renew_at == pytest.approx(15)
+    finally:
+        st.close()
+
+
+def test_background_renewal(api, client):
+    client.renew_at = time.monotonic() + 0.2
+    client._schedule_renewal()
+    # The renewal schedules the next one, so wait on this timer
+    timer = client._renew_timer
+    timer.join(5)
+    assert not timer.is_alive()
+    assert client.token == 'token-2'
+
+
+def test_retries_once_after_401(api, client):
+    api.revoked.add('token-1')
+    assert get(client) == 'token-2'
+    assert [g['grant_type'] for g in api.grants] == ['password', 'refresh_token']
+
+
+def test_401_after_renewal_is_an_error(api, client):
+    api.revoked.update(['token-1', 'token-2'])
+    with pytest.raises(ApiError) as e:
+        get(client)
+    assert 'Status: 401' in e.value.msg
+    assert len(api.grants) == 2
+
+
+def test_falls_back_to_password_grant(api, client):
+    api.refresh_fails = True
+    api.revoked.add('token-1')
+    assert get(client) == 'token-2'
+    assert [g['grant_type'] for g in api.grants] == ['password', 'refresh_token', 'password']
+
+
+def test_permanent_token_is_not_renewed(api):
+    st = ApiClient(token='permanent', account='acct')
+    api.revoked.add('permanent')
+    with pytest.raises(ApiError):
+        get(st)
+    assert api.grants == []
+
+
+def test_concurrent_401s_renew_once(api, client):
+    api.revoked.add('token-1')
+    api.delay = 0.05
+    tokens, barrier = list(), threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        tokens.append(get(client))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert tokens == ['token-2'] * 8
+    assert [g['grant_type'] for g in api.grants] == ['password', 'refresh_token']
+
+
+def unavailable(code=503):
+    return HTTPError('https://striketracker.highwinds.com', code, 'Unavailable', dict(), io.BytesIO(b'{}'))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = list()
+    monkeypatch.setattr(striketracker_client.time, 'sleep', delays.append)
+    return delays
+
+
+def test_timeout_is_the_larger_limit_bounded_by_the_deadline(api):
+    st = ApiClient(token='t', account='acct', connect_timeout=10, read_timeout=60)
+    assert st._timeout('url', None) == 60
+    assert st._timeout('url', time.monotonic() + 30) == pytest.approx(30, abs=1)
+
+
+def test_first_attempt_gets_a_deadline_below_connect_timeout(api):
+    st = ApiClient(token='t', account='acct', connect_timeout=10, deadline=3)
+    assert get(st) == 't'
+    assert 0 < api.timeouts[-1] <= 3
+
+
+@pytest.mark.parametrize('retry, remaining', [(False, 0), (False, -1), (True, 5)])
+def test_timeout_refuses_without_budget(api, retry, remaining):
+    st = ApiClient(token='t', account='acct', connect_timeout=10)
+    with pytest.raises(ApiError) as e:
+        st._timeout('url', time.monotonic() + remaining, retry=retry)
+    assert 'Deadline exceeded' in e.value.msg
+
+
+def test_backoff(api, sleeps):
+    st = ApiClient(token='t', account='acct', connect_timeout=10)
+    assert st._backoff(0, None)
+    assert st._backoff(3, None)
+    assert st._backoff(10, None)
+    assert sleeps == [0.5, 4, 10]
+    assert not st._backoff(0, time.monotonic() + 10)
+    assert st._backoff(0, time.monotonic() + 20)
+
+
+@pytest.mark.parametrize('error', [unavailable(503), unavailable(429), URLError('refused')])
+def test_retries_transient_errors(api, sleeps, error):
+    st = ApiClient(token='t', account='acct', retries=2)
+    api.failures = [error, error]
+    assert get(st) == 't'
+    assert sleeps == [0.5, 1]
+
+
+def test_gives_up_after_retries(api, sleeps):
+    st = ApiClient(token='t', account='acct', retries=1)
+    api.failures = [unavailable(), unavailable()]
+    with pytest.raises(ApiError) as e:
+        get(st)
+    assert 'Status: 503' in e.value.msg
+    assert sleeps == [0.5]
+
+
+def test_does_not_retry_other_errors_or_posts(api, sleeps):
+    st = ApiClient(token='t', account='acct', retries=2)
+    api.failures = [unavailable(500)]
+    with pytest.raises(ApiError):
+        get(st)
+    api.failures = [unavailable(503)]
+    with pytest.raises(ApiError):
+        st.request('POST', st.apiurl + '/origins', b'{}')
+    assert sleeps == []
+
+
+def test_no_retry_when_the_deadline_cannot_cover_it(api, sleeps):
+    st = ApiClient(token='t', account='acct', retries=3, connect_timeout=10, deadline=5)
+    api.failures = [URLError('refused')]
+    with pytest.raises(ApiError) as e:
+        get(st)
+    assert 'refused' in e.value.msg
+    assert sleeps == []
+
+
+def test_deadline_exceeded(api):
+    st = ApiClient(token='t', account='acct', deadline=0)
+    with pytest.raises(ApiError) as e:
+        get(st)
+    assert 'Deadline exceeded' in e.value.msg
+    assert api.timeouts == []
@@ -0,0 +1,166 @@
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_flight import SingleFlight
+
+
+class Counter:
+    """ A slow fetch that counts its calls """
+
+    def __init__(self, result=b'body', delay=0.2):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.result
+
+
+def run_threads(flight, key, fn, count=8):
+    results, barrier = list(), threading.Barrier(count)
+
+    def worker():
+        barrier.wait()
+        results.append(flight.do(key, fn))
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+@pytest.mark.parametrize('directory', [False, True])
+def test_threads_share_one_call(tmp_path, directory):
+    flight = SingleFlight(str(tmp_path) if directory else None)
+    fn = Counter()
+    assert run_threads(flight, 'GET /origins', fn) == [b'body'] * 8
+    assert fn.calls == 1
+
+
+def test_threads_share_errors():
+    flight, errors, barrier = SingleFlight(), list(), threading.Barrier(4)
+
+    def fail():
+        time.sleep(0.2)
+        raise ValueError('boom')
+
+    def worker():
+        barrier.wait()
+        try:
+            flight.do('key', fail)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(errors) == 4
+    assert len(set(id(e) for e in errors)) == 1
+
+
+def test_different_keys_are_not_shared():
+    flight, fn = SingleFlight(), Counter(delay=0)
+    flight.do('a', fn)
+    flight.do('b', fn)
+    assert fn.calls == 2
+
+
+def fork_worker(directory, counter, barrier, results, result):
+    def fetch():
+        with open(counter, 'a') as f:
+            f.write('x')
+        time.sleep(0.5)
+        return result
+
+    barrier.wait()
+    results.put(SingleFlight(directory).do('GET /origins', fetch))
+
+
+@pytest.mark.parametrize('result', [b'body', b'', None])
+def test_processes_share_one_call(tmp_path, result):
+    ctx = multiprocessing.get_context('fork')
+    counter = str(tmp_path / 'calls')
+    directory = tmp_path / 'flight'
+    directory.mkdir()
+    barrier, results = ctx.Barrier(4), ctx.Queue()
+    procs = [ctx.Process(target=fork_worker,
+                         args=(str(directory), counter, barrier, results, result))
+             for _ in range(4)]
+    for p in procs:
+        p.start()
+    values = [results.get(timeout=10) for _ in procs]
+    for p in procs:
+        p.join()
+    assert values == [result] * 4
+    with open(counter) as f:
+        assert f.read() == 'x'
+
+
+def test_stale_result_is_not_used(tmp_path):
+    flight = SingleFlight(str(tmp_path))
+    assert flight.do('key', Counter(b'old', delay=0)) == b'old'
+    name = [n for n in os.listdir(str(tmp_path)) if n.endswith('.result')][0]
+    path = os.path.join(str(tmp_path), name)
+
+    # A result written before the caller arrived is never read
+    os.utime(path, (time.time() - 10, time.time() - 10))
+    assert flight._read(path, time.time()) == (False, None)
+    assert SingleFlight(str(tmp_path)).do('key', Counter(b'new', delay=0)) == b'new'
+
+
+def test_old_files_expire(tmp_path):
+    directory = str(tmp_path)
+    SingleFlight(directory).do('old', Counter(delay=0))
+    for name in os.listdir(directory):
+        os.utime(os.path.join(directory, name), (0, 0))
+
+    # A lock held by a leader in another process is kept
+    held = os.path.join(directory, 'held.lock')
+    fd = os.open(held, os.O_RDWR | os.O_CREAT, 0o600)
+    os.utime(held, (0, 0))
+    try:
+        assert SingleFlight()._try_lock(fd)
+        SingleFlight(directory).do('new', Counter(delay=0))
+        names = os.listdir(directory)
+    finally:
+        os.close(fd)
+    assert 'held.lock' in names
+    assert len(names) == 3
+
+
+def test_default_directory_is_private(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+    path = SingleFlight.default_directory()
+    assert os.stat(path).st_mode & 0o777 == 0o700
+    assert SingleFlight.default_directory() == path
+
+    os.chmod(path, 0o755)
+    with pytest.raises(OSError, match='not private'):
+        SingleFlight.default_directory()
+
+
+def test_default_directory_refuses_symlink(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+    target = tmp_path / 'elsewhere'
+    target.mkdir(mode=0o700)
+    os.symlink(str(target), str(tmp_path / ('highwinds-%d' % os.getuid())))
+    with pytest.raises(OSError, match='not a directory'):
+        SingleFlight.default_directory()
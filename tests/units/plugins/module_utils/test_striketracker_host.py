@@ -0,0 +1,91 @@
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import JsonHandler
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_host import Host, Scope, ScopeIndex
+
+
+def scope(id, path, platform='CDS'):
+    return dict(id=id, platform=platform, path=path, name='scope-%d' % id,
+                createdDate='2022-01-01T00:00:00Z', updatedDate='2022-01-01T00:00:00Z')
+
+
+def decode(d):
+    return json.loads(json.dumps(d), object_hook=JsonHandler.find_class)
+
+
+def host(scopes):
+    return decode(dict(name='host', hashCode='a1b2c3', type='SITE', services=[],
+                       scopes=scopes, createdDate='2022-01-01T00:00:00Z',
+                       updatedDate='2022-01-01T00:00:00Z'))
+
+
+@pytest.fixture
+def index():
+    return ScopeIndex([Scope(scope(1, '/')),
+                       Scope(scope(2, '/a')),
+                       Scope(scope(3, '/a/b/')),
+                       Scope(scope(4, '/a/b/c', 'ALL')),
+                       Scope(scope(5, '/', 'ALL')),
+                       Scope(scope(6, '/x', 'CDN'))])
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('/a', 2), ('a', 2), ('/a/', 2), ('/a/b', 3), ('/', 1), ('/a/c', None),
+])
+def test_get_normalizes_paths(index, path, expected):
+    found = index.get(path)
+    assert (found.id if found is not None else None) == expected
+
+
+@pytest.mark.parametrize('path, platform, expected', [
+    ('/a/x', 'CDS', 2),
+    ('/a/bc', 'CDS', 2),
+    ('/a/b/x.js', 'CDS', 3),
+    # A longer ALL scope wins over a shorter scope of the platform
+    ('/a/b/c/d', 'CDS', 4),
+    # At the same path the platform wins
+    ('/z', 'CDS', 1),
+    ('/x/y', 'CDN', 6),
+    ('/z', 'CDN', 5),
+    ('/z', 'ALL', 5),
+])
+def test_match_longest_prefix(index, path, platform, expected):
+    assert index.match(path, platform).id == expected
+
+
+def test_match_without_scopes():
+    assert ScopeIndex().match('/a') is None
+    assert ScopeIndex([Scope(scope(1, '/a'))]).match('/b') is None
+
+
+def test_duplicate_paths_are_kept():
+    index = ScopeIndex([Scope(scope(1, '/a')), Scope(scope(2, '/a/'))])
+    assert len(index) == 2
+    assert [s.id for s in index.scopes()] == [1, 2]
+    assert index.get('/a').id == 1
+    assert index.match('/a/b').id == 1
+
+
+def test_host_decodes_every_platform():
+    h = host([scope(1, '/'), scope(2, '/x', 'CDN'), scope(3, '/', 'ALL')])
+    assert isinstance(h, Host)
+    assert all(isinstance(s, Scope) for s in h.scopes)
+    assert len(h.scope_index) == 3
+    assert h.scope_index.match('/x/y', 'CDN').id == 2
+    assert [s['id'] for s in h.to_dict()['scopes']] == [1, 2, 3]
+
+
+def test_host_keeps_scopes_it_cannot_index():
+    partial = dict(id=2, platform='CDS', path='/p')
+    h = host([scope(1, '/'), partial, scope(3, None)])
+    assert len(h.scope_index) == 1
+    assert h.scope_index.match('/p').id == 1
+    assert h.to_dict()['scopes'][1] == partial
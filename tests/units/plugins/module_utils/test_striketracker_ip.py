@@ -0,0 +1,122 @@
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import ipaddress
+import json
+import random
+
+import pytest
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import JsonHandler
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_ip import (
+    IpList, _ip_ranges, _ip_subtract)
+
+
+def ip(address):
+    return int(ipaddress.ip_address(u'%s' % address))
+
+
+def test_ip_ranges_merges_overlapping_and_adjacent():
+    ranges = _ip_ranges(['10.0.1.0/24', '10.0.0.0/24', '10.0.0.128/25',
+                         '10.0.3.0/24', '2001:db8::/33', '2001:db8:8000::/33'])
+    assert ranges[4] == [(ip('10.0.0.0'), ip('10.0.1.255')),
+                         (ip('10.0.3.0'), ip('10.0.3.255'))]
+    assert ranges[6] == [(ip('2001:db8::'), ip('2001:db8:ffff:ffff:ffff:ffff:ffff:ffff'))]
+
+
+def test_ip_ranges_accepts_host_bits_and_addresses():
+    assert _ip_ranges([' 192.0.2.7/24', '192.0.2.1'])[4] == [(ip('192.0.2.0'), ip('192.0.2.255'))]
+
+
+@pytest.mark.parametrize('a, b, expected', [
+    ([(0, 99)], [], [(0, 99)]),
+    ([(0, 99)], [(0, 99)], []),
+    ([(0, 99)], [(10, 19), (30, 39)], [(0, 9), (20, 29), (40, 99)]),
+    ([(10, 19), (30, 39)], [(0, 14), (35, 50)], [(15, 19), (30, 34)]),
+    ([(10, 19), (30, 39)], [(20, 29)], [(10, 19), (30, 39)]),
+    ([(10, 19)], [(0, 5), (25, 30)], [(10, 19)]),
+])
+def test_ip_subtract(a, b, expected):
+    assert _ip_subtract(a, b) == expected
+
+
+def test_ip_subtract_matches_sets():
+    rng = random.Random(0)
+
+    def spans():
+        points = sorted(rng.sample(range(1000), 20))
+        return list(zip(points[::2], points[1::2]))
+
+    for _ in range(100):
+        a, b = spans(), spans()
+        expected = set(i for s, e in a for i in range(s, e + 1)) - \
+            set(i for s, e in b for i in range(s, e + 1))
+        result = _ip_subtract(a, b)
+        assert set(i for s, e in result for i in range(s, e + 1)) == expected
+
+
+def test_list_is_the_smallest_cidr_list():
+    ips = IpList(dict(list=['10.0.1.0/24', '10.0.0.0/24', '2001:db8::/32', '10.0.0.5/32']))
+    assert ips.list == ['10.0.0.0/23', '2001:db8::/32']
+    assert len(ips) == 2
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('10.0.0.0', True),
+    ('10.0.1.255', True),
+    ('10.0.2.0', False),
+    ('9.255.255.255', False),
+    ('10.0.1.0/24', True),
+    ('10.0.0.0/22', False),
+    ('2001:db8::1', True),
+    ('2001:db9::1', False),
+])
+def test_contains(address, expected):
+    ips = IpList(dict(list=['10.0.0.0/24', '10.0.1.0/24', '2001:db8::/32']))
+    assert (address in ips) is expected
+
+
+def test_contains_empty():
+    assert '10.0.0.1' not in IpList()
+
+
+def test_diff():
+    ips = IpList(dict(list=['10.0.0.0/23', '192.0.2.0/24', '2001:db8::/32']))
+    diff = ips.diff(['10.0.0.0/24', '192.0.2.0/24', '198.51.100.0/24', '2001:db8::/33'])
+    assert diff == dict(added=['10.0.1.0/24', '2001:db8:8000::/33'],
+                        removed=['198.51.100.0/24'])
+
+
+def test_diff_unchanged():
+    ips = IpList(dict(list=['10.0.0.0/23']))
+    assert ips.diff(['10.0.1.0/24', '10.0.0.0/24']) == dict(added=[], removed=[])
+
+
+def test_diff_removes_whole_entries_when_the_cdn_shrinks():
+    ips = IpList(dict(list=['69.16.128.0/19']))
+    assert ips.diff(['69.16.128.0/18']) == dict(added=['69.16.128.0/19'],
+                                                removed=['69.16.128.0/18'])
+
+
+def test_diff_partial_overlap():
+    ips = IpList(dict(list=['10.1.0.0/16']))
+    assert ips.diff(['10.0.0.0/8']) == dict(added=['10.1.0.0/16'], removed=['10.0.0.0/8'])
+    ips = IpList(dict(list=['10.0.0.0/8']))
+    assert ips.diff(['10.1.0.0/16']) == dict(
+        added=['10.0.0.0/16', '10.2.0.0/15', '10.4.0.0/14', '10.8.0.0/13',
+               '10.16.0.0/12', '10.32.0.0/11', '10.64.0.0/10', '10.128.0.0/9'],
+        removed=[])
+
+
+def test_diff_keeps_entries_as_given():
+    ips = IpList(dict(list=['10.0.0.0/24']))
+    assert ips.diff(['10.0.0.7/24', ' 10.0.1.0/24']) == dict(added=[], removed=[' 10.0.1.0/24'])
+
+
+def test_decoded_from_api_response():
+    ips = json.loads('{"list": ["10.0.0.0/24", "10.0.1.0/24"]}', object_hook=JsonHandler.find_class)
+    assert isinstance(ips, IpList)
+    assert ips.list == ['10.0.0.0/23']
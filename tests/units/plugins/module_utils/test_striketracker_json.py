@@ -0,0 +1,76 @@
+# Copyright: (c) 2022, Skyler Hardy <skyler.hardy@protonmail.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils import striketracker_json
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_client import ApiClient, ApiError
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_json import dumps, encode_payload
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_host import Host, Scope
+from ansible_collections.sd_hardy.highwinds.plugins.module_utils.striketracker_origin import Origin
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def backend(request, monkeypatch):
+    if request.param == 'orjson' and not striketracker_json.HAS_ORJSON:
+        pytest.skip('orjson is not installed')
+    monkeypatch.setattr(striketracker_json, 'HAS_ORJSON', request.param == 'orjson')
+    return request.param
+
+
+def origin():
+    return Origin(dict(id=1, name='one', hostname='one.example.com', port=80, path='/',
+                       verifyCertificate=True))
+
+
+def test_dumps_model(backend):
+    body = dumps(origin())
+    assert isinstance(body, bytes)
+    assert b' ' not in body
+    assert json.loads(body) == origin().to_dict()
+
+
+def test_dumps_nested_models(backend):
+    scope = Scope(dict(id=2, platform='CDS', path='/', createdDate='c', updatedDate='u'))
+    data = dict(origins=[origin()], nested=dict(scope=scope), name=u'café')
+    assert json.loads(dumps(data)) == dict(origins=[origin().to_dict()],
+                                           nested=dict(scope=scope.to_dict()),
+                                           name=u'café')
+
+
+def test_dumps_rejects_unknown_objects(backend):
+    with pytest.raises(TypeError):
+        dumps(dict(value=object()))
+
+
+@pytest.mark.parametrize('payload, expected', [
+    (None, None),
+    (b'{"name":"one"}', b'{"name":"one"}'),
+    (u'{"name": "café"}', u'{"name": "café"}'.encode('utf-8')),
+])
+def test_encode_payload_passes_encoded_json_through(backend, payload, expected):
+    assert encode_payload(payload) == expected
+
+
+def test_encode_payload_encodes_data(backend):
+    assert json.loads(encode_payload(dict(name='one', port=80))) == dict(name='one', port=80)
+    assert json.loads(encode_payload(origin())) == origin().to_dict()
+
+
+def test_client_to_json_raises_api_error(backend):
+    st = ApiClient(token='t', account='acct')
+    with pytest.raises(ApiError) as e:
+        st._to_json(dict(password='secret', value=object()))
+    assert 'Unable to convert payload to JSON' in e.value.msg
+    assert 'secret' not in e.value.msg
+
+
+def test_host_to_json(backend):
+    host = Host(dict(name='host', hashCode='a1', type='SITE', services=[], scopes=[],
+                     createdDate='c', updatedDate='u'))
+    assert json.loads(host.to_json())['hashCode'] == 'a1'